@@ -1,4 +1,5 @@
 import math
+from typing import Dict, List, Optional
 from src.core.models.node import PowerNode, NodeType
 
 class EnergyHeuristics:
@@ -43,14 +44,9 @@ class EnergyHeuristics:
         processed_edges = set()
 
         for node in graph.nodes.values():
-            if node.active:
-                total_useful_load += node.current_load * node.efficiency
-
-        for node in graph.nodes.values():
-            if node.active and node.current_load > 0:
-                if node.efficiency > 0 and node.efficiency < 1.0:
-                    node_losses = node.current_load * (1.0 - node.efficiency) / node.efficiency
-                    total_losses += node_losses
+            useful, losses = EnergyHeuristics._node_terms(node, node.current_load)
+            total_useful_load += useful
+            total_losses += losses
 
         for node_id, edges in graph.adj_list.items():
             for edge in edges:
@@ -58,46 +54,161 @@ class EnergyHeuristics:
                 if edge_key in processed_edges:
                     continue
                 processed_edges.add(edge_key)
-                
-                source_node = graph.get_node(edge.source)
-                target_node = graph.get_node(edge.target)
-                
-                if not source_node or not target_node or not source_node.active or not target_node.active:
+                total_losses += EnergyHeuristics._edge_losses(graph, edge)
+
+        return EnergyHeuristics._efficiency_ratio(total_useful_load, total_losses)
+
+    @staticmethod
+    def calculate_global_efficiency_for_parents(graph, consumer: PowerNode, parent_ids: List[int],
+                                                load_overrides: Optional[List[Dict[int, float]]] = None) -> List[float]:
+        """
+        Equivale a calcular calculate_global_efficiency com consumer.parent_id = p para cada p
+        em parent_ids (mesmos valores, a menos de arredondamento), sem repetir a varredura do grafo
+        a cada candidato. Os totais de carga útil e de perdas são calculados uma vez; por candidato,
+        só as parcelas das arestas incidentes ao consumidor são retiradas e recalculadas.
+        Nenhum nó é alterado: parent_id e cargas simuladas só entram no cálculo das parcelas.
+
+        Args:
+            graph: Grafo da rede
+            consumer: Consumidor cuja atribuição é simulada
+            parent_ids: Transformadores candidatos a pai
+            load_overrides: Opcional. Um dict {node_id: carga simulada} por candidato (mesma ordem
+                de parent_ids), aplicado junto com o parent_id; as parcelas dos nós citados e de
+                suas arestas também são refeitas.
+
+        Returns:
+            Lista de eficiências, na mesma ordem de parent_ids
+        """
+        if load_overrides is None:
+            load_overrides = [{} for _ in parent_ids]
+        
+        # Totais da rede atual e a parcela de perda de cada linha (uma por par de nós)
+        base_useful = 0.0
+        base_losses = 0.0
+        for node in graph.nodes.values():
+            useful, losses = EnergyHeuristics._node_terms(node, node.current_load)
+            base_useful += useful
+            base_losses += losses
+        
+        edge_terms = {}  # par de nós -> (aresta considerada, perdas atuais)
+        for node_id, edges in graph.adj_list.items():
+            for edge in edges:
+                edge_key = tuple(sorted([edge.source, edge.target]))
+                if edge_key in edge_terms:
+                    continue
+                edge_losses = EnergyHeuristics._edge_losses(graph, edge)
+                edge_terms[edge_key] = (edge, edge_losses)
+                base_losses += edge_losses
+        
+        results = []
+        for parent_id, loads in zip(parent_ids, load_overrides):
+            parents = {consumer.id: parent_id}
+            total_useful_load = base_useful
+            total_losses = base_losses
+            
+            touched = []
+            for node_id, load in loads.items():
+                node = graph.get_node(node_id)
+                if node is None:
                     continue
-                
-                load_passing = 0.0
-                is_hierarchical = False
-                
-                if edge.current_flow > 0.1:
-                    load_passing = edge.current_flow
+                touched.append(node_id)
+                old_useful, old_losses = EnergyHeuristics._node_terms(node, node.current_load)
+                new_useful, new_losses = EnergyHeuristics._node_terms(node, load)
+                total_useful_load += new_useful - old_useful
+                total_losses += new_losses - old_losses
+            
+            # Linhas afetadas: as do consumidor e as dos nós com carga simulada
+            affected = {}
+            for node_id in (consumer.id, *touched):
+                for edge in graph.adj_list.get(node_id, ()):
+                    edge_key = tuple(sorted([edge.source, edge.target]))
+                    affected[edge_key] = edge_terms[edge_key]
+            for edge, old_losses in affected.values():
+                total_losses += EnergyHeuristics._edge_losses(graph, edge, parents, loads) - old_losses
+            
+            results.append(EnergyHeuristics._efficiency_ratio(
+                EnergyHeuristics._drop_residue(total_useful_load),
+                EnergyHeuristics._drop_residue(total_losses)))
+        return results
+
+    @staticmethod
+    def _node_terms(node: PowerNode, load: float):
+        """
+        Parcelas (carga útil, perdas) de um nó com a carga informada; usado tanto pela
+        varredura completa quanto pela simulação de candidatos, para que não divirjam.
+        """
+        if not node.active:
+            return 0.0, 0.0
+        useful = load * node.efficiency
+        if load > 0 and node.efficiency > 0 and node.efficiency < 1.0:
+            return useful, load * (1.0 - node.efficiency) / node.efficiency
+        return useful, 0.0
+
+    @staticmethod
+    def _drop_residue(total: float) -> float:
+        """Zera o resíduo de arredondamento deixado ao retirar e repor parcelas de um total."""
+        return 0.0 if abs(total) < 1e-9 else total
+
+    @staticmethod
+    def _edge_losses(graph, edge, parents: Optional[Dict[int, Optional[int]]] = None,
+                     loads: Optional[Dict[int, float]] = None) -> float:
+        """
+        Perdas de uma aresta no cálculo da eficiência global (0.0 se não conduz carga).
+        `parents` ({node_id: parent_id}) e `loads` ({node_id: carga}) substituem o parent_id
+        e a carga dos nós citados na simulação.
+        """
+        source_node = graph.get_node(edge.source)
+        target_node = graph.get_node(edge.target)
+        
+        if not source_node or not target_node or not source_node.active or not target_node.active:
+            return 0.0
+        
+        load_passing = 0.0
+        is_hierarchical = False
+        source_parent = source_node.parent_id
+        target_parent = target_node.parent_id
+        if parents:
+            source_parent = parents.get(source_node.id, source_parent)
+            target_parent = parents.get(target_node.id, target_parent)
+        source_load = source_node.current_load
+        target_load = target_node.current_load
+        if loads:
+            source_load = loads.get(source_node.id, source_load)
+            target_load = loads.get(target_node.id, target_load)
+        
+        if edge.current_flow > 0.1:
+            load_passing = edge.current_flow
+            is_hierarchical = True
+        else:
+            if (source_node.type == NodeType.TRANSFORMER and target_node.type == NodeType.CONSUMER):
+                if target_parent == source_node.id:
+                    is_hierarchical = True
+                    load_passing = target_load
+            elif (target_node.type == NodeType.TRANSFORMER and source_node.type == NodeType.CONSUMER):
+                if source_parent == target_node.id:
                     is_hierarchical = True
-                else:
-                    if (source_node.type == NodeType.TRANSFORMER and target_node.type == NodeType.CONSUMER):
-                        if target_node.parent_id == source_node.id:
-                            is_hierarchical = True
-                            load_passing = target_node.current_load
-                    elif (target_node.type == NodeType.TRANSFORMER and source_node.type == NodeType.CONSUMER):
-                        if source_node.parent_id == target_node.id:
-                            is_hierarchical = True
-                            load_passing = source_node.current_load
-                    elif (source_node.type == NodeType.SUBSTATION and target_node.type == NodeType.TRANSFORMER):
-                        if target_node.parent_id == source_node.id:
-                            is_hierarchical = True
-                            load_passing = target_node.current_load
-                    elif (target_node.type == NodeType.SUBSTATION and source_node.type == NodeType.TRANSFORMER):
-                        if source_node.parent_id == target_node.id:
-                            is_hierarchical = True
-                            load_passing = source_node.current_load
-                
-                if is_hierarchical and load_passing > 1.0:
-                    if edge.efficiency > 0 and edge.efficiency < 1.0:
-                        edge_losses = load_passing * (1.0 - edge.efficiency) / edge.efficiency
-                        total_losses += edge_losses
+                    load_passing = source_load
+            elif (source_node.type == NodeType.SUBSTATION and target_node.type == NodeType.TRANSFORMER):
+                if target_parent == source_node.id:
+                    is_hierarchical = True
+                    load_passing = target_load
+            elif (target_node.type == NodeType.SUBSTATION and source_node.type == NodeType.TRANSFORMER):
+                if source_parent == target_node.id:
+                    is_hierarchical = True
+                    load_passing = source_load
+        
+        if is_hierarchical and load_passing > 1.0:
+            if edge.efficiency > 0 and edge.efficiency < 1.0:
+                return load_passing * (1.0 - edge.efficiency) / edge.efficiency
+        return 0.0
 
+    @staticmethod
+    def _efficiency_ratio(total_useful_load: float, total_losses: float) -> float:
+        """E = carga útil / perdas, limitada a 1000 (rede sem perdas)."""
         if total_losses == 0:
             if total_useful_load == 0:
                 return 0.0
             return 1000.0
 
         efficiency = total_useful_load / total_losses
-        return min(efficiency, 1000.0)
\ No newline at end of file
+        return min(efficiency, 1000.0)
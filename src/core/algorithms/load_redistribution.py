@@ -49,8 +49,8 @@ class LoadRedistributor:
         self.recently_reactivated -= to_remove
         
         transformers = [
-            node for node in self.graph.nodes.values()
-            if node.active and node.type == NodeType.TRANSFORMER
+            node for node in self.graph.get_nodes_by_type(NodeType.TRANSFORMER)
+            if node.active
         ]
         
         overloaded_transformers = [
@@ -180,6 +180,7 @@ class LoadRedistributor:
         
         # Busca nas arestas conectadas ao transformador
         edges = self.graph.get_neighbors(transformer_id)
+        seen_ids = set()
         
         for edge in edges:
             # Determina qual nó é o vizinho
@@ -187,7 +188,8 @@ class LoadRedistributor:
             neighbor = self.graph.get_node(neighbor_id)
             
             if neighbor and neighbor.active and neighbor.type == NodeType.CONSUMER:
-                if neighbor not in consumers:
+                if neighbor.id not in seen_ids:
+                    seen_ids.add(neighbor.id)
                     consumers.append(neighbor)
         
         return consumers
@@ -207,8 +209,8 @@ class LoadRedistributor:
         
         # Busca todos os transformadores ativos
         transformers = [
-            node for node in self.graph.nodes.values()
-            if node.active and node.type == NodeType.TRANSFORMER
+            node for node in self.graph.get_nodes_by_type(NodeType.TRANSFORMER)
+            if node.active
             and node.id != source_transformer.id
             and node.id not in self.recently_reactivated
         ]
@@ -551,8 +553,8 @@ class LoadRedistributor:
         logs = []
         
         consumers = [
-            node for node in self.graph.nodes.values()
-            if node.active and node.type == NodeType.CONSUMER
+            node for node in self.graph.get_nodes_by_type(NodeType.CONSUMER)
+            if node.active
         ]
         
         for consumer in consumers:
@@ -10,6 +10,13 @@ from datetime import datetime
 from src.core.models.node import PowerNode, NodeType
 from src.core.models.graph import EcoGridGraph
 
+# Padrão senoidal para simular ciclo diário, pré-calculado por hora (0-23)
+# Pico às 14h (meio-dia), mínimo às 3h (madrugada)
+_DAILY_FACTORS = [
+    0.5 + 0.5 * math.sin((hour - 3) * (2 * math.pi / 24) + math.pi / 2)
+    for hour in range(24)
+]
+
 class IoTSensor:
     """
     Simula um sensor IoT instalado em um nó.
@@ -69,17 +76,16 @@ class IoTSensorNetwork:
         readings = {}
         
         # CORREÇÃO: Processa de BAIXO para CIMA (folhas → raiz)
+        # Usa as visões por tipo do grafo: um laço por tipo, sem testar node.type em cada nó
         # 1. Processa CONSUMIDORES primeiro (folhas da árvore - geram a demanda real)
-        for node_id, node in self.graph.nodes.items():
-            if node.active and node.type == NodeType.CONSUMER:
-                if node_id not in readings:
-                    self._collect_from_node_hierarchical(node_id, readings, tick, process_children_first=False)
+        for node in self.graph.get_nodes_by_type(NodeType.CONSUMER):
+            if node.active and node.id not in readings:
+                self._collect_from_node_hierarchical(node.id, readings, tick, process_children_first=False)
         
         # 2. Processa TRANSFORMADORES (agora os filhos consumidores já têm carga)
-        for node_id, node in self.graph.nodes.items():
-            if node.active and node.type == NodeType.TRANSFORMER:
-                if node_id not in readings:
-                    self._collect_from_node_hierarchical(node_id, readings, tick, process_children_first=False)
+        for node in self.graph.get_nodes_by_type(NodeType.TRANSFORMER):
+            if node.active and node.id not in readings:
+                self._collect_from_node_hierarchical(node.id, readings, tick, process_children_first=False)
         
         # 3. Processa SUBESTAÇÕES por último (agora todos os filhos têm carga)
         for root_id in self.graph.root_nodes:
@@ -282,13 +288,8 @@ class IoTSensorNetwork:
     
     def _get_time_variation(self, tick: int) -> float:
         """Simula variação temporal (padrões diários/sazonais)."""
-        # Ciclo diário (24 ticks)
-        hour = tick % 24
-        
-        # Padrão senoidal para simular ciclo diário
-        # Pico às 14h (meio-dia), mínimo às 3h (madrugada)
-        hour_rad = (hour - 3) * (2 * math.pi / 24)
-        daily_factor = 0.5 + 0.5 * math.sin(hour_rad + math.pi/2)
+        # Ciclo diário (24 ticks): o fator só depende da hora, então é tabelado
+        daily_factor = _DAILY_FACTORS[tick % 24]
         
         # Adiciona ruído aleatório
         noise = random.uniform(0.95, 1.05)
@@ -3,6 +3,9 @@ class PowerLine:
     Representa uma linha de transmissão (Aresta) baseada em física.
     Usado para cálculo de perdas reais (P = I²R).
     """
+    # Uma instância por sentido de cada aresta: slots evitam o __dict__ por objeto
+    __slots__ = ('source', 'target', 'distance', 'resistance', 'efficiency', 'current_flow')
+
     def __init__(self, source_id: int, target_id: int, distance_km: float, resistance_ohm: float, efficiency: float = 0.99):
         self.source = source_id
         self.target = target_id
@@ -1,6 +1,7 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from src.core.models.node import PowerNode
 from src.core.models.edge import PowerLine
+from src.core.structures.spatial_grid import SpatialGrid
 
 class EcoGridGraph:
     """
@@ -17,6 +18,28 @@ class EcoGridGraph:
         # Estrutura hierárquica explícita
         self.root_nodes: List[int] = []  # IDs das subestações (raiz da hierarquia)
 
+        # Versão da topologia: incrementada a cada nó adicionado e em clear() (invalida índices derivados)
+        self._version = 0
+
+        # Visões por tipo de nó {tipo: [PowerNode, ...]}, reconstruídas quando a topologia muda
+        self._type_views: Dict[str, List[PowerNode]] = {}
+        self._type_views_key = None
+
+        # Índice espacial sobre (x, y), reconstruído sob demanda quando a topologia muda
+        self._spatial = SpatialGrid()
+        self._spatial_key = None
+
+        # Versão das conexões: incrementada a cada aresta adicionada e em clear()
+        self._edge_version = 0
+
+        # Índice de arestas {(origem, destino): PowerLine}, reconstruído quando as conexões mudam
+        self._edge_index: Dict[Tuple[int, int], PowerLine] = {}
+        self._edge_index_key = None
+
+        # Vizinhos por tipo {(id, tipo): [(vizinho, linha), ...]}, preenchido sob demanda
+        self._typed_neighbors: Dict[Tuple[int, str], List[Tuple[PowerNode, PowerLine]]] = {}
+        self._typed_neighbors_key = None
+
     def add_node(self, node_id: int, node_type: str, max_capacity: float, x: float = 0, y: float = 0, efficiency: float = 0.98, parent_id: int = None) -> PowerNode:
         """
         Adiciona um nó ao grafo mantendo a hierarquia.
@@ -26,6 +49,7 @@ class EcoGridGraph:
             new_node = PowerNode(node_id, node_type, max_capacity, x, y, efficiency, parent_id)
             self.nodes[node_id] = new_node
             self.adj_list[node_id] = [] # Inicializa lista de vizinhos vazia
+            self._version += 1
             
             # Mantém hierarquia explícita
             if node_type == "SUBESTACAO" and parent_id is None:
@@ -67,21 +91,107 @@ class EcoGridGraph:
             # Sentido V -> U (Mesmos parâmetros físicos)
             line_vu = PowerLine(v_id, u_id, distance, resistance, efficiency)
             self.adj_list[v_id].append(line_vu)
+            self._edge_version += 1
         else:
             raise ValueError(f"Tentativa de conectar nós inexistentes: {u_id}, {v_id}")
 
+    def clear(self):
+        """
+        Remove todos os nós e conexões.
+        Use este método em vez de limpar os dicionários diretamente: as versões de topologia
+        e de conexões são incrementadas, invalidando todos os índices derivados.
+        """
+        self.nodes.clear()
+        self.adj_list.clear()
+        self.root_nodes.clear()
+        self._version += 1
+        self._edge_version += 1
+
     def get_neighbors(self, node_id: int) -> List[PowerLine]:
         """Retorna todas as linhas conectadas a um nó específico."""
         return self.adj_list.get(node_id, [])
     
+    def get_neighbors_by_type(self, node_id: int, node_type: str) -> List[Tuple[PowerNode, PowerLine]]:
+        """
+        Retorna os pares (vizinho, linha) dos vizinhos de um nó que são do tipo indicado
+        (ativos ou não). A linha é a que parte de node_id.
+        O resultado de cada nó é calculado uma vez e reaproveitado até a topologia mudar.
+        A lista retornada é compartilhada: não modificar.
+        """
+        key = (self._version, self._edge_version)
+        if self._typed_neighbors_key != key:
+            self._typed_neighbors = {}
+            self._typed_neighbors_key = key
+
+        pairs = self._typed_neighbors.get((node_id, node_type))
+        if pairs is None:
+            pairs = []
+            nodes = self.nodes
+            for line in self.adj_list.get(node_id, ()):
+                neighbor = nodes.get(line.target if line.source == node_id else line.source)
+                if neighbor is not None and neighbor.type == node_type:
+                    pairs.append((neighbor, line))
+            self._typed_neighbors[(node_id, node_type)] = pairs
+        return pairs
+
     def get_edge_obj(self, u_id: int, v_id: int):
-        """Retorna o objeto PowerLine que conecta U e V."""
-        if u_id in self.adj_list:
-            for line in self.adj_list[u_id]:
-                if line.target == v_id:
-                    return line
-        return None
+        """
+        Retorna o objeto PowerLine que conecta U e V em O(1).
+        O índice é refeito quando arestas são adicionadas ou o grafo é limpo (clear).
+        """
+        key = self._edge_version
+        if self._edge_index_key != key:
+            index: Dict[Tuple[int, int], PowerLine] = {}
+            for u, lines in self.adj_list.items():
+                for line in lines:
+                    # Mantém a primeira linha de cada par, como a busca linear fazia
+                    index.setdefault((u, line.target), line)
+            self._edge_index = index
+            self._edge_index_key = key
+        return self._edge_index.get((u_id, v_id))
 
     def get_node(self, node_id: int) -> PowerNode:
         """Recupera um objeto PowerNode pelo ID."""
-        return self.nodes.get(node_id)
\ No newline at end of file
+        return self.nodes.get(node_id)
+
+    def get_nodes_by_type(self, node_type: str) -> List[PowerNode]:
+        """
+        Retorna os nós de um tipo (ativos ou não), sem varrer todo o dicionário a cada chamada.
+        O tipo de um nó não muda após a criação, então a visão só é refeita quando nós são
+        adicionados ou o grafo é limpo (clear). A lista retornada é compartilhada: não modificar.
+        """
+        key = self._version
+        if self._type_views_key != key:
+            views: Dict[str, List[PowerNode]] = {}
+            for node in self.nodes.values():
+                views.setdefault(node.type, []).append(node)
+            self._type_views = views
+            self._type_views_key = key
+        return self._type_views.get(node_type, [])
+
+    def _get_spatial_index(self) -> SpatialGrid:
+        """
+        Retorna o índice espacial dos nós, reconstruindo-o se a topologia mudou.
+        """
+        key = self._version
+        if self._spatial_key != key:
+            self._spatial.clear()
+            for node in self.nodes.values():
+                self._spatial.insert(node.id, node.x, node.y)
+            self._spatial_key = key
+        return self._spatial
+
+    def nearest(self, x: float, y: float, k: int = 1, exclude: int = None) -> List[int]:
+        """
+        Retorna os IDs dos k nós mais próximos de (x, y), ordenados pela distância.
+
+        Args:
+            x, y: Coordenadas de referência
+            k: Quantidade de nós desejada
+            exclude: ID de um nó a ser ignorado (ex.: o próprio nó de origem)
+        """
+        return self._get_spatial_index().nearest(x, y, k, exclude)
+
+    def within_radius(self, x: float, y: float, r: float) -> List[int]:
+        """Retorna os IDs dos nós a até r de (x, y), do mais próximo ao mais distante."""
+        return self._get_spatial_index().within_radius(x, y, r)
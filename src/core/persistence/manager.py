@@ -1,8 +1,25 @@
 import pickle
 import os
+import gc
+from contextlib import contextmanager
 from typing import Dict, List, Any
 from src.core.models.graph import EcoGridGraph
 
+@contextmanager
+def _gc_paused():
+    """
+    Suspende o coletor de lixo durante (de)serializações em massa.
+    O pickle cria milhares de objetos pequenos e o GC geracional seria disparado
+    repetidamente sem nada para coletar. Restaura o estado anterior ao sair.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
 class PersistenceManager:
     """
     Gerenciador de Persistência:
@@ -17,8 +34,6 @@ class PersistenceManager:
         """
         Salva apenas a definição estrutural da rede.
         """
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        
         # 1. Extrair dados dos Nós (Blueprint)
         nodes_data = []
         for node in graph.nodes.values():
@@ -42,13 +57,8 @@ class PersistenceManager:
                 # Cria uma chave única ordenada para verificar duplicidade (1-2 é igual a 2-1)
                 edge_key = tuple(sorted((line.source, line.target)))
                 if edge_key not in processed_edges:
-                    edges_data.append({
-                        'u': line.source,
-                        'v': line.target,
-                        'dist': line.distance,
-                        'res': line.resistance,
-                        'eff': line.efficiency
-                    })
+                    # Registro plano (u, v, dist, res, eff): evita um dict por aresta
+                    edges_data.append((line.source, line.target, line.distance, line.resistance, line.efficiency))
                     processed_edges.add(edge_key)
 
         blueprint = {
@@ -57,7 +67,13 @@ class PersistenceManager:
         }
 
         try:
-            with open(filepath, 'wb') as f:
+            try:
+                f = open(filepath, 'wb')
+            except FileNotFoundError:
+                # Diretório ainda não existe: cria apenas na primeira gravação
+                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                f = open(filepath, 'wb')
+            with f, _gc_paused():
                 pickle.dump(blueprint, f)
             # print(f"[Topologia] Estrutura salva em {filepath}")
         except Exception as e:
@@ -69,11 +85,13 @@ class PersistenceManager:
         Lê o arquivo de topologia e reconstrói o grafo.
         Retorna True se conseguiu carregar.
         """
-        if not os.path.exists(filepath):
-            return False
-
         try:
-            with open(filepath, 'rb') as f:
+            try:
+                # Abre direto (EAFP): evita um stat extra antes do open
+                f = open(filepath, 'rb')
+            except FileNotFoundError:
+                return False
+            with f, _gc_paused():
                 blueprint = pickle.load(f)
 
             # 1. Recriar Nós
@@ -90,12 +108,16 @@ class PersistenceManager:
 
             # 2. Recriar Arestas
             for e_data in blueprint['edges']:
+                if isinstance(e_data, dict):
+                    # Formato antigo (um dict por aresta)
+                    e_data = (e_data['u'], e_data['v'], e_data['dist'], e_data['res'], e_data['eff'])
+                u_id, v_id, distance, resistance, efficiency = e_data
                 graph.add_edge(
-                    u_id=e_data['u'],
-                    v_id=e_data['v'],
-                    distance=e_data['dist'],
-                    resistance=e_data['res'],
-                    efficiency=e_data['eff']
+                    u_id=u_id,
+                    v_id=v_id,
+                    distance=distance,
+                    resistance=resistance,
+                    efficiency=efficiency
                 )
             
             # print(f"[Topologia] Rede reconstruída: {len(graph.nodes)} nós.")
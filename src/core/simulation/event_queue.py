@@ -1,8 +1,13 @@
-import heapq
-from collections import deque, Counter
+import sys
+from bisect import insort
+from collections import deque
+import itertools
 from datetime import datetime, timedelta
-from typing import Any, Optional, List, Dict, Callable
-from dataclasses import dataclass, field
+from typing import Any, Optional, List, Dict, Callable, Union, Deque
+from dataclasses import dataclass
+
+# Sentinela que marca entradas removidas da fila (remoção preguiçosa)
+_REMOVED = object()
 
 class EventType:
     LOAD_CHANGE = "MUDANCA_CARGA"
@@ -20,53 +25,89 @@ class PriorityLevel:
     MEDIUM = 2    # Manutenção preventiva
     LOW = 3       # Leitura de rotina / Log
 
-@dataclass(order=True)
+# Nomes legíveis das prioridades (usado no __repr__ e nas estatísticas)
+_PRIORITY_NAMES = {
+    PriorityLevel.CRITICAL: 'CRITICAL',
+    PriorityLevel.HIGH: 'HIGH',
+    PriorityLevel.MEDIUM: 'MEDIUM',
+    PriorityLevel.LOW: 'LOW'
+}
+
+# slots=True (sem __dict__ por instância) só existe a partir do Python 3.10; o projeto suporta 3.9+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class GridEvent:
     """
     Representa um evento na rede.
-    Decorador @dataclass(order=True) gera automaticamente os métodos de comparação (__lt__, etc).
-    A comparação é feita campo por campo na ordem de declaração.
+    A ordenação é feita pela fila a partir de (prioridade, contador de chegada),
+    então o evento não precisa de métodos de comparação próprios.
     """
-    priority: int # Primeiro campo: define a ordenação no Heap
-    timestamp: datetime = field(compare=False) # Não ordenar por data se prioridade empatar
-    event_type: str = field(compare=False)
-    node_id: int = field(compare=False)
-    payload: Any = field(compare=False, default=None)
+    priority: int # Menor número = maior prioridade
+    # Tick monotônico da simulação (int) ou datetime (legado); uma fila aceita só um dos dois
+    timestamp: Union[int, datetime]
+    event_type: str
+    node_id: int
+    payload: Any = None
 
     def __repr__(self):
-        p_name = "UNKNOWN"
-        if self.priority == 0: p_name = "CRITICAL"
-        elif self.priority == 1: p_name = "HIGH"
-        elif self.priority == 2: p_name = "MEDIUM"
-        elif self.priority == 3: p_name = "LOW"
-        
-        return f"[{p_name}] {self.event_type} -> Node {self.node_id}"
+        return f"[{_PRIORITY_NAMES.get(self.priority, 'UNKNOWN')}] {self.event_type} -> Node {self.node_id}"
 
 class FIFOEventQueue:
-    """Fila simples ."""
-    def __init__(self):
-        self._queue = deque()
+    """
+    Fila simples sobre um buffer circular pré-alocado.
+    Os slots são reaproveitados indefinidamente; a lista só cresce (dobrando) ao transbordar.
+    Complexidade: O(1) amortizado para enqueue e dequeue.
+    """
+    def __init__(self, capacity: int = 64):
+        if capacity <= 0:
+            raise ValueError("A capacidade da fila deve ser maior que zero.")
+        self._buf: List[Optional[GridEvent]] = [None] * capacity
+        self._head = 0  # Próximo item a sair
+        self._tail = 0  # Próximo slot livre
+        self._size = 0
 
     def enqueue(self, event: GridEvent):
-        self._queue.append(event)
+        capacity = len(self._buf)
+        if self._size == capacity:
+            # Realinha os itens a partir do índice 0 e dobra a capacidade
+            self._buf = self._buf[self._head:] + self._buf[:self._head] + [None] * capacity
+            self._head = 0
+            self._tail = self._size
+            capacity *= 2
+        self._buf[self._tail] = event
+        self._tail = (self._tail + 1) % capacity
+        self._size += 1
 
     def dequeue(self) -> Optional[GridEvent]:
-        return self._queue.popleft() if self._queue else None
+        if self._size == 0:
+            return None
+        event = self._buf[self._head]
+        self._buf[self._head] = None  # Libera a referência para o GC
+        self._head = (self._head + 1) % len(self._buf)
+        self._size -= 1
+        return event
 
     def is_empty(self) -> bool:
-        return len(self._queue) == 0
+        return self._size == 0
     
     def size(self) -> int:
-        return len(self._queue)
+        return self._size
 
 class PriorityEventQueue:
     """
     Fila de Prioridade aprimorada.
-    Usa um Min-Heap binário para garantir que eventos CRITICAL saiam primeiro.
-    Complexidade: O(log n) para push e pop.
+    Usa uma fila de baldes (bucket queue): um deque FIFO por nível de prioridade,
+    com os níveis mantidos em ordem (bisect). Como há poucos níveis (CRITICAL..LOW),
+    push e pop são O(1) e não há operações de sift como em um heap binário.
+    
+    Cada entrada é uma lista mutável [prioridade, contador, evento].
+    Dentro de um balde a ordem de chegada é preservada, e remoções apenas marcam
+    a entrada com _REMOVED (remoção preguiçosa): pop() descarta essas entradas
+    quando chegam à frente do balde.
     
     Melhorias implementadas:
-    - Remoção de eventos específicos
+    - Remoção de eventos específicos (O(1) via índice por (node_id, event_type))
     - Atualização de prioridade
     - Estatísticas da fila
     - Limpeza de eventos obsoletos
@@ -81,12 +122,144 @@ class PriorityEventQueue:
             max_size: Tamanho máximo da fila. Se None, não há limite.
                      Quando atingido, eventos LOW são descartados primeiro.
         """
-        self._heap = []
+        self._buckets: Dict[int, Deque[list]] = {}
+        self._priorities: List[int] = []  # Níveis com balde criado, em ordem crescente
         self._max_size = max_size
+        # Índice (node_id, event_type) -> entradas vivas (pode haver mais de uma sem check_duplicates)
+        self._entry_finder: Dict[tuple, List[list]] = {}
+        # Índice invertido node_id -> tipos de evento presentes (dict como conjunto ordenado)
+        self._node_index: Dict[int, Dict[str, None]] = {}
+        self._counter = itertools.count()
+        self._size = 0        # Eventos vivos
+        self._tombstones = 0  # Entradas marcadas como removidas ainda presentes nos baldes
+        # Domínio dos timestamps dos eventos vivos: True = datetime, False = tick (int).
+        # Fixado pelo primeiro evento inserido na fila vazia; domínios não se misturam.
+        self._datetime_timestamps: Optional[bool] = None
+
+    def _bucket(self, priority: int) -> Deque[list]:
+        """Retorna o balde de uma prioridade, criando-o (em ordem) se necessário."""
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = deque()
+            insort(self._priorities, priority)
+        return bucket
+
+    def _iter_entries(self):
+        """Percorre todas as entradas (inclusive removidas) em ordem de prioridade e chegada."""
+        for priority in self._priorities:
+            yield from self._buckets[priority]
+
+    def _index(self, entry: list):
+        """Registra uma entrada viva nos índices por chave e por nó."""
+        event = entry[-1]
+        key = (event.node_id, event.event_type)
+        entries = self._entry_finder.get(key)
+        if entries is None:
+            self._entry_finder[key] = [entry]
+            self._node_index.setdefault(event.node_id, {})[event.event_type] = None
+        else:
+            entries.append(entry)
+
+    def _drop_key(self, key: tuple) -> Optional[List[list]]:
+        """Remove uma chave (node_id, event_type) dos índices e retorna suas entradas."""
+        entries = self._entry_finder.pop(key, None)
+        if entries is not None:
+            node_types = self._node_index[key[0]]
+            del node_types[key[1]]
+            if not node_types:
+                del self._node_index[key[0]]
+        return entries
+
+    def _check_timestamps(self, events) -> None:
+        """
+        Garante que os eventos usam o mesmo domínio de timestamp (tick ou datetime) da fila.
+        Validado antes de qualquer alteração, para que uma inserção rejeitada não mude a fila.
+        """
+        expected = self._datetime_timestamps if self._size else None
+        for event in events:
+            is_datetime = isinstance(event.timestamp, datetime)
+            if expected is None:
+                expected = is_datetime
+            elif is_datetime != expected:
+                raise TypeError(
+                    "Timestamps misturados na fila: use apenas ticks (int) ou apenas datetime "
+                    f"(evento do nó {event.node_id} com {type(event.timestamp).__name__})."
+                )
+
+    def _add_entry(self, priority: int, event: GridEvent):
+        """Cria a entrada, indexa e anexa ao balde da prioridade (O(1))."""
+        if not self._size:
+            self._datetime_timestamps = isinstance(event.timestamp, datetime)
+        entry = [priority, next(self._counter), event]
+        self._index(entry)
+        self._bucket(priority).append(entry)
+        self._size += 1
+
+    def _mark_removed(self, entry: list):
+        """Marca uma entrada como removida sem tocar no balde (O(1))."""
+        entry[-1] = _REMOVED
+        self._size -= 1
+        self._tombstones += 1
+
+    def _maybe_compact(self):
+        """
+        Remove fisicamente as entradas marcadas quando passam de 25% do total.
+        Amortiza a reconstrução O(n) dos baldes sobre muitas remoções O(1).
+        """
+        if self._tombstones * 4 > self._size + self._tombstones:
+            for priority in self._priorities:
+                bucket = self._buckets[priority]
+                self._buckets[priority] = deque(e for e in bucket if e[-1] is not _REMOVED)
+            self._tombstones = 0
+
+    def _unindex(self, entry: list):
+        """Remove uma entrada viva do índice (node_id, event_type)."""
+        event = entry[-1]
+        key = (event.node_id, event.event_type)
+        entries = self._entry_finder.get(key)
+        if entries is not None:
+            entries.remove(entry)
+            if not entries:
+                self._drop_key(key)
+
+    def _remove_where(self, should_remove: Callable[[GridEvent], bool]) -> int:
+        """
+        Remove (preguiçosamente) os eventos vivos para os quais `should_remove` é True.
+        Apenas desindexa e marca as entradas; a compactação fica a cargo de _maybe_compact,
+        então uma varredura sem remoções não realoca nada.
+        
+        Returns:
+            Número de eventos removidos
+        """
+        removed_count = 0
+        for entry in self._iter_entries():
+            event = entry[-1]
+            if event is not _REMOVED and should_remove(event):
+                self._unindex(entry)
+                self._mark_removed(entry)
+                removed_count += 1
+        if removed_count:
+            self._maybe_compact()
+        return removed_count
+
+    def _pop_live(self) -> Optional[list]:
+        """Retira a próxima entrada viva (menor prioridade, mais antiga) ou None."""
+        buckets = self._buckets
+        for priority in self._priorities:
+            bucket = buckets[priority]
+            while bucket:
+                entry = bucket.popleft()
+                if entry[-1] is _REMOVED:
+                    self._tombstones -= 1
+                    continue
+                self._unindex(entry)
+                self._size -= 1
+                return entry
+        return None
 
     def push(self, event: GridEvent, check_duplicates: bool = True) -> bool:
         """
-        Insere mantendo a propriedade do Heap (O(log n)).
+        Insere o evento no balde da sua prioridade (O(1)).
         
         Args:
             event: Evento a ser inserido
@@ -96,52 +269,126 @@ class PriorityEventQueue:
         Returns:
             True se o evento foi inserido, False se foi descartado (fila cheia)
         """
+        self._check_timestamps((event,))
+        
         # Verifica duplicatas se solicitado
         if check_duplicates:
             self._remove_duplicates(event.node_id, event.event_type)
         
         # Verifica limite de tamanho
-        if self._max_size is not None and len(self._heap) >= self._max_size:
+        max_size = self._max_size
+        if max_size is not None and self._size >= max_size:
             # Se a fila está cheia, tenta descartar eventos LOW primeiro
             if event.priority == PriorityLevel.LOW:
                 return False  # Descarta evento LOW se fila cheia
             
-            # Remove o evento de menor prioridade (último no heap ordenado)
-            # Para manter eficiência, removemos eventos LOW se existirem
-            low_events = [e for e in self._heap if e.priority == PriorityLevel.LOW]
-            if low_events:
-                self._heap.remove(low_events[0])
-                heapq.heapify(self._heap)
+            # Remove o evento LOW mais antigo para abrir espaço
+            low_entry = next((e for e in self._buckets.get(PriorityLevel.LOW, ())
+                              if e[-1] is not _REMOVED), None)
+            if low_entry is not None:
+                self._unindex(low_entry)
+                self._mark_removed(low_entry)
+                self._maybe_compact()
             else:
                 # Se não há eventos LOW, descarta o novo evento
                 return False
         
-        heapq.heappush(self._heap, event)
+        self._add_entry(event.priority, event)
         return True
 
+    def push_many(self, events: List[GridEvent], check_duplicates: bool = False) -> int:
+        """
+        Insere vários eventos de uma vez.
+        
+        Args:
+            events: Eventos a inserir
+            check_duplicates: Se True, cada evento substitui os existentes com mesmo
+                            node_id e event_type (inclusive os anteriores do próprio lote)
+        
+        Returns:
+            Número de eventos efetivamente inseridos
+        """
+        self._check_timestamps(events)
+        
+        if self._max_size is not None:
+            # Com limite de tamanho, cada inserção pode descartar/ejetar eventos
+            return sum(1 for e in events if self.push(e, check_duplicates=check_duplicates))
+        
+        add_entry = self._add_entry
+        if check_duplicates:
+            remove_duplicates = self._remove_duplicates
+            for e in events:
+                remove_duplicates(e.node_id, e.event_type)
+                add_entry(e.priority, e)
+        else:
+            for e in events:
+                add_entry(e.priority, e)
+        return len(events)
+
     def pop(self) -> Optional[GridEvent]:
-        """Remove e retorna o evento de maior prioridade (O(log n))."""
-        if self.is_empty():
-            return None
-        return heapq.heappop(self._heap)
+        """Remove e retorna o evento de maior prioridade (O(1) amortizado)."""
+        entry = self._pop_live()
+        return entry[-1] if entry is not None else None
+
+    def pop_batch(self, n: int) -> List[GridEvent]:
+        """
+        Remove e retorna até n eventos em ordem de prioridade numa única chamada.
+        
+        Args:
+            n: Quantidade máxima de eventos
+        
+        Returns:
+            Lista (possivelmente vazia) com os eventos retirados
+        """
+        batch = []
+        while len(batch) < n:
+            entry = self._pop_live()
+            if entry is None:
+                break
+            batch.append(entry[-1])
+        return batch
 
     def is_empty(self) -> bool:
-        return len(self._heap) == 0
+        return self._size == 0
     
     def peek(self) -> Optional[GridEvent]:
         """Retorna o próximo evento sem removê-lo."""
-        return self._heap[0] if not self.is_empty() else None
+        for priority in self._priorities:
+            bucket = self._buckets[priority]
+            # Descarta entradas removidas que chegaram à frente do balde
+            while bucket and bucket[0][-1] is _REMOVED:
+                bucket.popleft()
+                self._tombstones -= 1
+            if bucket:
+                return bucket[0][-1]
+        return None
+    
+    def top_k(self, k: int) -> List[GridEvent]:
+        """
+        Retorna os k próximos eventos (em ordem de saída) sem removê-los.
+        Percorre os baldes apenas até reunir k eventos vivos.
+        
+        Args:
+            k: Quantidade máxima de eventos
+        """
+        events = []
+        if k <= 0:
+            return events
+        for entry in self._iter_entries():
+            event = entry[-1]
+            if event is not _REMOVED:
+                events.append(event)
+                if len(events) == k:
+                    break
+        return events
     
     def get_all_events(self) -> List[GridEvent]:
         """
         Retorna uma lista ordenada de todos os eventos na fila sem removê-los.
         Útil para visualização em tempo real.
-        Complexidade: O(n log n) devido à ordenação.
+        Complexidade: O(n) - os baldes já estão em ordem de prioridade e chegada.
         """
-        if self.is_empty():
-            return []
-        # Retorna uma cópia ordenada do heap (não modifica o original)
-        return sorted(self._heap.copy())
+        return [e[-1] for e in self._iter_entries() if e[-1] is not _REMOVED]
     
     def get_events_by_priority(self, priority: int) -> List[GridEvent]:
         """
@@ -153,11 +400,12 @@ class PriorityEventQueue:
         Returns:
             Lista de eventos com a prioridade especificada
         """
-        return [e for e in self._heap if e.priority == priority]
+        return [e[-1] for e in self._buckets.get(priority, ()) if e[-1] is not _REMOVED]
     
     def get_events_by_node(self, node_id: int) -> List[GridEvent]:
         """
         Retorna todos os eventos relacionados a um nó específico.
+        Complexidade: O(k), k = eventos do nó (via índice invertido).
         
         Args:
             node_id: ID do nó
@@ -165,11 +413,33 @@ class PriorityEventQueue:
         Returns:
             Lista de eventos do nó
         """
-        return [e for e in self._heap if e.node_id == node_id]
+        events = []
+        for event_type in self._node_index.get(node_id, ()):
+            events.extend(entry[-1] for entry in self._entry_finder[(node_id, event_type)])
+        return events
+    
+    def get_event(self, node_id: int, event_type: str) -> Optional[GridEvent]:
+        """
+        Retorna o evento (node_id, event_type) que sairia primeiro da fila, sem removê-lo.
+        Complexidade: O(1) via índice (O(k) se houver k duplicatas da mesma chave).
+        
+        Args:
+            node_id: ID do nó
+            event_type: Tipo do evento
+        
+        Returns:
+            O evento encontrado ou None
+        """
+        entries = self._entry_finder.get((node_id, event_type))
+        if not entries:
+            return None
+        # Mesma ordem de get_all_events: prioridade e, no empate, chegada
+        entry = entries[0] if len(entries) == 1 else min(entries, key=lambda e: (e[0], e[1]))
+        return entry[-1]
     
     def has_event(self, node_id: int, event_type: str) -> bool:
         """
-        Verifica se existe um evento específico na fila.
+        Verifica se existe um evento específico na fila (O(1)).
         
         Args:
             node_id: ID do nó
@@ -178,11 +448,11 @@ class PriorityEventQueue:
         Returns:
             True se o evento existe, False caso contrário
         """
-        return any(e.node_id == node_id and e.event_type == event_type for e in self._heap)
+        return (node_id, event_type) in self._entry_finder
     
     def remove_event(self, node_id: int, event_type: str) -> bool:
         """
-        Remove um evento específico da fila.
+        Remove um evento específico da fila (O(1) por entrada).
         
         Args:
             node_id: ID do nó
@@ -191,21 +461,17 @@ class PriorityEventQueue:
         Returns:
             True se o evento foi removido, False se não foi encontrado
         """
-        original_size = len(self._heap)
-        self._heap = [e for e in self._heap if not (e.node_id == node_id and e.event_type == event_type)]
-        
-        if len(self._heap) < original_size:
-            heapq.heapify(self._heap)  # Reorganiza o heap após remoção
-            return True
-        return False
+        entries = self._drop_key((node_id, event_type))
+        if not entries:
+            return False
+        for entry in entries:
+            self._mark_removed(entry)
+        self._maybe_compact()
+        return True
     
     def _remove_duplicates(self, node_id: int, event_type: str):
         """Remove eventos duplicados (mesmo node_id e event_type) antes de inserir novo."""
-        original_size = len(self._heap)
-        self._heap = [e for e in self._heap if not (e.node_id == node_id and e.event_type == event_type)]
-        
-        if len(self._heap) < original_size:
-            heapq.heapify(self._heap)
+        self.remove_event(node_id, event_type)
     
     def update_priority(self, node_id: int, event_type: str, new_priority: int) -> bool:
         """
@@ -220,19 +486,20 @@ class PriorityEventQueue:
         Returns:
             True se o evento foi atualizado, False se não foi encontrado
         """
-        # Encontra o evento
-        event_to_update = None
-        for e in self._heap:
-            if e.node_id == node_id and e.event_type == event_type:
-                event_to_update = e
-                break
-        
-        if event_to_update is None:
+        entries = self._entry_finder.get((node_id, event_type))
+        if not entries:
             return False
         
-        # Remove o evento antigo
-        self._heap.remove(event_to_update)
-        heapq.heapify(self._heap)
+        # Entrada antiga: a mais antiga com essa chave, pelo contador
+        old_entry = entries[0] if len(entries) == 1 else min(entries, key=lambda e: e[1])
+        if old_entry[0] == new_priority:
+            return True  # Prioridade inalterada: mantém a posição atual no balde
+        
+        # Invalida a entrada antiga e insere a nova no balde da nova prioridade (O(1))
+        event_to_update = old_entry[-1]
+        self._unindex(old_entry)
+        self._mark_removed(old_entry)
+        self._maybe_compact()
         
         # Cria novo evento com prioridade atualizada
         updated_event = GridEvent(
@@ -244,15 +511,19 @@ class PriorityEventQueue:
         )
         
         # Insere o evento atualizado
-        heapq.heappush(self._heap, updated_event)
+        self._add_entry(new_priority, updated_event)
         return True
     
-    def clear_old_events(self, max_age_seconds: float = 300.0) -> int:
+    def clear_old_events(self, max_age_seconds: float = 300.0, now: Optional[Union[int, datetime]] = None) -> int:
         """
         Remove eventos mais antigos que o limite especificado.
         
         Args:
-            max_age_seconds: Idade máxima em segundos (padrão: 5 minutos)
+            max_age_seconds: Idade máxima em segundos (padrão: 5 minutos).
+                             Se `now` for um tick, a idade é medida em ticks.
+            now: Instante de referência na mesma unidade dos timestamps dos eventos
+                 (ex.: tick atual do simulador). Se None, usa datetime.now(), o que só
+                 vale para filas com timestamps datetime.
         
         Returns:
             Número de eventos removidos
@@ -260,21 +531,25 @@ class PriorityEventQueue:
         if self.is_empty():
             return 0
         
-        now = datetime.now()
-        cutoff_time = now - timedelta(seconds=max_age_seconds)
-        
-        original_size = len(self._heap)
-        self._heap = [e for e in self._heap if e.timestamp > cutoff_time]
+        if now is None:
+            if not self._datetime_timestamps:
+                raise ValueError("Fila com timestamps em ticks: informe o tick atual em `now`.")
+            now = datetime.now()
+        elif isinstance(now, datetime) != self._datetime_timestamps:
+            raise TypeError("`now` deve estar no mesmo domínio (tick ou datetime) dos timestamps da fila.")
         
-        removed_count = original_size - len(self._heap)
-        if removed_count > 0:
-            heapq.heapify(self._heap)
+        if isinstance(now, datetime):
+            cutoff_time = now - timedelta(seconds=max_age_seconds)
+        else:
+            cutoff_time = now - max_age_seconds
         
-        return removed_count
+        # Com timestamps em ticks (int) a comparação é direta, sem relógio do sistema
+        return self._remove_where(lambda e: e.timestamp <= cutoff_time)
     
     def clear_by_priority(self, priority: int) -> int:
         """
         Remove todos os eventos de uma prioridade específica.
+        Só o balde da prioridade é percorrido.
         
         Args:
             priority: Nível de prioridade a ser removido
@@ -282,13 +557,18 @@ class PriorityEventQueue:
         Returns:
             Número de eventos removidos
         """
-        original_size = len(self._heap)
-        self._heap = [e for e in self._heap if e.priority != priority]
-        
-        removed_count = original_size - len(self._heap)
-        if removed_count > 0:
-            heapq.heapify(self._heap)
-        
+        bucket = self._buckets.get(priority)
+        if not bucket:
+            return 0
+        removed_count = 0
+        for entry in bucket:
+            if entry[-1] is _REMOVED:
+                self._tombstones -= 1
+            else:
+                self._unindex(entry)
+                removed_count += 1
+        bucket.clear()
+        self._size -= removed_count
         return removed_count
     
     def clear_by_filter(self, filter_func: Callable[[GridEvent], bool]) -> int:
@@ -301,14 +581,7 @@ class PriorityEventQueue:
         Returns:
             Número de eventos removidos
         """
-        original_size = len(self._heap)
-        self._heap = [e for e in self._heap if not filter_func(e)]
-        
-        removed_count = original_size - len(self._heap)
-        if removed_count > 0:
-            heapq.heapify(self._heap)
-        
-        return removed_count
+        return self._remove_where(filter_func)
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -331,34 +604,45 @@ class PriorityEventQueue:
                 'newest_timestamp': None
             }
         
-        priorities = [e.priority for e in self._heap]
-        event_types = [e.event_type for e in self._heap]
-        timestamps = [e.timestamp for e in self._heap]
-        
-        # Mapeia prioridades para nomes
-        priority_names = {
-            PriorityLevel.CRITICAL: 'CRITICAL',
-            PriorityLevel.HIGH: 'HIGH',
-            PriorityLevel.MEDIUM: 'MEDIUM',
-            PriorityLevel.LOW: 'LOW'
-        }
+        # Passada única: contagens e timestamps extremos sem listas intermediárias
+        by_pri: Dict[int, int] = {}
+        by_type: Dict[str, int] = {}
+        oldest = newest = None
+        total = 0
+        for entry in self._iter_entries():
+            e = entry[-1]
+            if e is _REMOVED:
+                continue
+            total += 1
+            by_pri[e.priority] = by_pri.get(e.priority, 0) + 1
+            by_type[e.event_type] = by_type.get(e.event_type, 0) + 1
+            ts = e.timestamp
+            if oldest is None or ts < oldest:
+                oldest = ts
+            if newest is None or ts > newest:
+                newest = ts
         
         by_priority = {}
-        for priority, count in Counter(priorities).items():
-            by_priority[priority_names.get(priority, f'UNKNOWN_{priority}')] = count
+        for priority, count in by_pri.items():
+            by_priority[_PRIORITY_NAMES.get(priority, f'UNKNOWN_{priority}')] = count
         
         return {
-            'total': len(self._heap),
+            'total': total,
             'by_priority': by_priority,
-            'by_type': dict(Counter(event_types)),
-            'oldest_timestamp': min(timestamps) if timestamps else None,
-            'newest_timestamp': max(timestamps) if timestamps else None
+            'by_type': by_type,
+            'oldest_timestamp': oldest,
+            'newest_timestamp': newest
         }
     
     def size(self) -> int:
         """Retorna o número de eventos na fila."""
-        return len(self._heap)
+        return self._size
     
     def clear(self):
         """Remove todos os eventos da fila."""
-        self._heap.clear()
\ No newline at end of file
+        self._buckets.clear()
+        self._priorities.clear()
+        self._size = 0
+        self._entry_finder.clear()
+        self._node_index.clear()
+        self._tombstones = 0
@@ -1,5 +1,6 @@
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Deque, Callable
+from collections import deque
+from bisect import bisect_right
 import random
 
 from src.core.models.graph import EcoGridGraph
@@ -17,7 +18,45 @@ class GridSimulator:
     O Maestro do EcoGrid+. 
     Centraliza todas as operações do backend, gerencia o tempo e a persistência.
     """
-    def __init__(self):
+    # Idade máxima (em ticks) dos eventos na fila: ~300s com o passo padrão de 100ms da UI
+    EVENT_MAX_AGE_TICKS = 3000
+    # Eventos processados por tick (além destes, os CRITICAL recém-criados são sempre drenados)
+    EVENTS_PER_TICK = 5
+    # Logs mantidos em memória para a UI (buffer circular: o mais antigo é descartado em O(1))
+    MAX_LOGS = 50
+    # Faixas de severidade de sobrecarga (uso >= limiar), em ordem crescente, e o nível de cada uma
+    OVERLOAD_THRESHOLDS = (1.0, 1.2, 1.5)
+    OVERLOAD_LEVELS = (
+        (PriorityLevel.MEDIUM, "MÉDIA"),
+        (PriorityLevel.HIGH, "ALTA"),
+        (PriorityLevel.CRITICAL, "CRÍTICA"),
+    )
+    # Cenário padrão: (id, tipo, capacidade, x, y, eficiência, pai)
+    DEFAULT_NODES = (
+        (1, NodeType.SUBSTATION, 10000, 50, 50, 1.0, None),
+        (10, NodeType.TRANSFORMER, 1000, 150, 100, 0.95, 1),
+        (20, NodeType.TRANSFORMER, 1000, 150, 300, 0.95, 1),
+        (101, NodeType.CONSUMER, 100, 250, 80, 0.98, 10),
+        (102, NodeType.CONSUMER, 150, 280, 120, 0.98, 10),
+        (201, NodeType.CONSUMER, 120, 250, 320, 0.98, 20),
+    )
+    # (origem, destino, distância, resistência, eficiência)
+    DEFAULT_EDGES = (
+        (1, 10, 10.0, 0.05, 0.99),
+        (1, 20, 12.0, 0.05, 0.99),
+        (10, 101, 0.5, 0.2, 0.95),
+        (10, 102, 0.8, 0.2, 0.95),
+        (20, 201, 0.6, 0.2, 0.95),
+        (10, 20, 5.0, 0.1, 0.98),
+    )
+
+    def __init__(self, verbose: bool = False):
+        """
+        Args:
+            verbose: Se True, além de guardar em self.logs, imprime cada log no stdout.
+                     Desligado por padrão: o print custa mais que o próprio passo da simulação.
+        """
+        self.verbose = verbose
         self.graph = EcoGridGraph()
         self.avl = AVLTree()
         self.event_queue = PriorityEventQueue()
@@ -26,7 +65,17 @@ class GridSimulator:
         self.enable_noise = True
         self.iot_network = None
         self.time_tick = 0
-        self.logs: List[str] = [] 
+        self.logs: Deque[str] = deque(maxlen=self.MAX_LOGS)
+        
+        # Marca cargas alteradas desde o último _update_infrastructure_loads (evita recálculo redundante no fim do step)
+        self._infra_dirty = True
+        
+        # Tabela de despacho de eventos: um acesso a dict por evento em vez da cadeia de if/elif
+        self._event_handlers: Dict[str, Callable[[GridEvent], bool]] = {
+            EventType.OVERLOAD_WARNING: self._on_overload_warning,
+            EventType.NODE_FAILURE: self._on_node_failure,
+            EventType.MAINTENANCE: self._on_maintenance,
+        }
 
     def initialize_default_scenario(self):
         """
@@ -51,12 +100,10 @@ class GridSimulator:
     def _sync_avl_from_graph(self):
         """Reinsere os nós do grafo carregado na árvore AVL para buscas rápidas."""
         self.log("Sincronizando AVL com o Grafo carregado...")
-        self.avl = AVLTree()
-        count = 0
-        for node in self.graph.nodes.values():
-            self.avl.insert(int(node.id), node)
-            count += 1
-        self.log(f"AVL Sincronizada: {count} nós indexados.")
+        # Todas as chaves são conhecidas: ordena uma vez e monta a árvore já balanceada
+        items = sorted(((int(node.id), node) for node in self.graph.nodes.values()), key=lambda item: item[0])
+        self.avl = AVLTree.build_from_sorted(items)
+        self.log(f"AVL Sincronizada: {len(items)} nós indexados.")
     
     def _get_connected_transformers(self, node_id: int, active_only: bool = True) -> List[Tuple[PowerNode, Any]]:
         """
@@ -69,18 +116,11 @@ class GridSimulator:
         Returns:
             Lista de tuplas (transformador, aresta) conectados ao nó
         """
-        transformers = []
-        edges = self.graph.get_neighbors(node_id)
-        
-        for edge in edges:
-            neighbor_id = edge.target if edge.source == node_id else edge.source
-            neighbor = self.graph.get_node(neighbor_id)
-            
-            if neighbor and neighbor.type == NodeType.TRANSFORMER:
-                if not active_only or neighbor.active:
-                    transformers.append((neighbor, edge))
-        
-        return transformers
+        # Vizinhança por tipo vem do cache do grafo; só o estado ativo é checado a cada chamada
+        pairs = self.graph.get_neighbors_by_type(node_id, NodeType.TRANSFORMER)
+        if not active_only:
+            return list(pairs)
+        return [(transformer, edge) for transformer, edge in pairs if transformer.active]
     
     def _get_transformer_consumer_edge(self, transformer_id: int, consumer_id: int) -> Optional[Any]:
         """
@@ -113,28 +153,28 @@ class GridSimulator:
         if not transformer:
             return consumers
         
+        # IDs já incluídos: pertinência O(1) em vez de varrer a lista a cada vizinho
+        seen_ids = set()
+        
         # Busca via hierarquia (filhos diretos)
         children = self.graph.get_children(transformer_id)
         for child in children:
             if child.active and child.type == NodeType.CONSUMER:
-                if child not in consumers:
+                if child.id not in seen_ids:
+                    seen_ids.add(child.id)
                     consumers.append(child)
         
         # Busca via arestas (redistribuição proporcional)
         if include_redistributed:
-            edges = self.graph.get_neighbors(transformer_id)
-            for edge in edges:
-                neighbor_id = edge.target if edge.source == transformer_id else edge.source
-                neighbor = self.graph.get_node(neighbor_id)
-                
-                if (neighbor and neighbor.active and neighbor.type == NodeType.CONSUMER and
-                    neighbor not in consumers):
+            for neighbor, _ in self.graph.get_neighbors_by_type(transformer_id, NodeType.CONSUMER):
+                if neighbor.active and neighbor.id not in seen_ids:
                     # Verifica se este transformador está realmente alimentando este consumidor
                     transformer_to_consumer_edge = self._get_transformer_consumer_edge(transformer_id, neighbor.id)
                     if transformer_to_consumer_edge:
                         # Se há edge.current_flow > 0 ou se é o parent_id, está alimentando
                         if (transformer_to_consumer_edge.current_flow > 0 or 
                             neighbor.parent_id == transformer_id):
+                            seen_ids.add(neighbor.id)
                             consumers.append(neighbor)
         
         return consumers
@@ -144,19 +184,11 @@ class GridSimulator:
         Criação manual do cenário mantendo hierarquia explícita.
         Hierarquia: SUBESTACAO → TRANSFORMADOR → CONSUMIDOR
         """
-        self.add_node(1, NodeType.SUBSTATION, 10000, 50, 50, efficiency=1.0, parent_id=None)
-        self.add_node(10, NodeType.TRANSFORMER, 1000, 150, 100, efficiency=0.95, parent_id=1)
-        self.add_node(20, NodeType.TRANSFORMER, 1000, 150, 300, efficiency=0.95, parent_id=1)
-        self.add_node(101, NodeType.CONSUMER, 100, 250, 80, efficiency=0.98, parent_id=10)
-        self.add_node(102, NodeType.CONSUMER, 150, 280, 120, efficiency=0.98, parent_id=10)
-        self.add_node(201, NodeType.CONSUMER, 120, 250, 320, efficiency=0.98, parent_id=20)
-        
-        self.graph.add_edge(1, 10, 10.0, 0.05, 0.99)
-        self.graph.add_edge(1, 20, 12.0, 0.05, 0.99)
-        self.graph.add_edge(10, 101, 0.5, 0.2, 0.95)
-        self.graph.add_edge(10, 102, 0.8, 0.2, 0.95)
-        self.graph.add_edge(20, 201, 0.6, 0.2, 0.95)
-        self.graph.add_edge(10, 20, 5.0, 0.1, 0.98)
+        for node_args in self.DEFAULT_NODES:
+            self.add_node(*node_args)
+        
+        for edge_args in self.DEFAULT_EDGES:
+            self.graph.add_edge(*edge_args)
 
     def add_node(self, nid, ntype, cap, x, y, efficiency=0.98, parent_id=None):
         """
@@ -180,19 +212,15 @@ class GridSimulator:
         
         if self.enable_noise:
             redistributed_consumers_old_loads = {}
-            for consumer in self.graph.nodes.values():
-                if consumer.active and consumer.type == NodeType.CONSUMER:
+            for consumer in self.graph.get_nodes_by_type(NodeType.CONSUMER):
+                if consumer.active:
                     # Verifica se este consumidor tem redistribuição ativa (edge.current_flow > 0)
-                    edges = self.graph.get_neighbors(consumer.id)
                     has_redistribution = False
-                    for edge in edges:
-                        neighbor_id = edge.target if edge.source == consumer.id else edge.source
-                        neighbor = self.graph.get_node(neighbor_id)
-                        if neighbor and neighbor.type == NodeType.TRANSFORMER:
-                            transformer_to_consumer_edge = self.graph.get_edge_obj(neighbor.id, consumer.id)
-                            if transformer_to_consumer_edge and transformer_to_consumer_edge.current_flow > 0:
-                                has_redistribution = True
-                                break
+                    for neighbor, _ in self.graph.get_neighbors_by_type(consumer.id, NodeType.TRANSFORMER):
+                        transformer_to_consumer_edge = self.graph.get_edge_obj(neighbor.id, consumer.id)
+                        if transformer_to_consumer_edge and transformer_to_consumer_edge.current_flow > 0:
+                            has_redistribution = True
+                            break
                     
                     if has_redistribution:
                         redistributed_consumers_old_loads[consumer.id] = consumer.current_load
@@ -209,37 +237,8 @@ class GridSimulator:
                 except Exception as e:
                     self.log(f"Erro ao inicializar IoT, usando fallback: {e}")
                     self._simulate_random_fluctuations()
-            
-        self.time_tick += 1
-        
-        if self.enable_noise:
-            redistributed_consumers_old_loads = {}
-            for consumer in self.graph.nodes.values():
-                if consumer.active and consumer.type == NodeType.CONSUMER:
-                    edges = self.graph.get_neighbors(consumer.id)
-                    has_redistribution = False
-                    for edge in edges:
-                        neighbor_id = edge.target if edge.source == consumer.id else edge.source
-                        neighbor = self.graph.get_node(neighbor_id)
-                        if neighbor and neighbor.type == NodeType.TRANSFORMER:
-                            transformer_to_consumer_edge = self.graph.get_edge_obj(neighbor.id, consumer.id)
-                            if transformer_to_consumer_edge and transformer_to_consumer_edge.current_flow > 0:
-                                has_redistribution = True
-                                break
-                    
-                    if has_redistribution:
-                        redistributed_consumers_old_loads[consumer.id] = consumer.current_load
-            
-            if self.iot_network:
-                iot_readings = self.iot_network.collect_readings(self.time_tick)
-            else:
-                try:
-                    self.iot_network = IoTSensorNetwork(self.graph)
-                    self.log("Rede IoT reinicializada durante simulação.")
-                    iot_readings = self.iot_network.collect_readings(self.time_tick)
-                except Exception as e:
-                    self.log(f"Erro ao inicializar IoT, usando fallback: {e}")
-                    self._simulate_random_fluctuations()
+            # Leituras dos sensores alteraram as cargas dos consumidores
+            self._infra_dirty = True
             
             needs_infrastructure_update = False
             for consumer_id, old_load in redistributed_consumers_old_loads.items():
@@ -278,27 +277,40 @@ class GridSimulator:
             self._check_and_deactivate_critical_nodes()
 
         if self.time_tick % 50 == 0:
-            removed = self.event_queue.clear_old_events(max_age_seconds=300.0)
+            removed = self.event_queue.clear_old_events(self.EVENT_MAX_AGE_TICKS, now=self.time_tick)
             if removed > 0:
                 self.log(f"Limpeza automática: {removed} eventos antigos removidos da fila")
 
-        processed_count = 0
+        # Processa até EVENTS_PER_TICK eventos por tick; eventos CRITICAL recém-criados (desde o
+        # tick anterior) nunca ficam para o próximo tick, mesmo que o limite já tenha sido atingido.
+        # Os reinseridos (falhas que persistem) são mais antigos e seguem o limite normal.
+        queue = self.event_queue
+        batch = queue.pop_batch(self.EVENTS_PER_TICK)
+        oldest_new_tick = self.time_tick - 1
+        head = queue.peek()
+        while (head is not None and head.priority == PriorityLevel.CRITICAL
+               and head.timestamp >= oldest_new_tick):
+            batch.append(queue.pop())
+            head = queue.peek()
+        
+        if batch:
+            # Tratadores podem rebalancear cargas
+            self._infra_dirty = True
         events_to_reinsert = []
-        
-        while not self.event_queue.is_empty() and processed_count < 5:
-            event = self.event_queue.pop()
-            should_keep = self._handle_event(event)
-            if should_keep:
+        for event in batch:
+            if self._handle_event(event):
                 events_to_reinsert.append(event)
-            processed_count += 1
         
-        for event in events_to_reinsert:
-            self.event_queue.push(event, check_duplicates=False)
+        self.event_queue.push_many(events_to_reinsert)
 
+        # Decaimento do fluxo das linhas: só as que têm fluxo precisam da checagem de tipos
+        nodes = self.graph.nodes
         for lines in self.graph.adj_list.values():
             for line in lines:
-                source_node = self.graph.nodes.get(line.source)
-                target_node = self.graph.nodes.get(line.target)
+                if line.current_flow == 0.0:
+                    continue  # Caso mais comum: nada a decair nem a zerar
+                source_node = nodes.get(line.source)
+                target_node = nodes.get(line.target)
                 
                 if (source_node and target_node and
                     ((source_node.type == NodeType.TRANSFORMER and target_node.type == NodeType.CONSUMER) or
@@ -307,21 +319,26 @@ class GridSimulator:
                         continue
                 elif line.current_flow > 1.0:
                     line.current_flow *= 0.7
+                    self._infra_dirty = True
                 else:
                     line.current_flow = 0.0
+                    self._infra_dirty = True
 
-        self._update_infrastructure_loads()
+        # Só recalcula se algo mudou desde a última atualização (limpeza e redistribuição
+        # já atualizam por conta própria quando geram logs, isto é, quando alteram fluxos)
+        if self._infra_dirty:
+            self._update_infrastructure_loads()
 
     def _update_infrastructure_loads(self):
         """
         Atualiza cargas de transformadores e subestações baseado nos filhos.
         Garante que TODOS os consumidores sejam contados exatamente uma vez.
         """
-        self._ensure_all_consumers_have_transformer()
-        self._validate_proportional_distributions()
+        self._prepare_consumer_assignments()
         consumer_to_transformers = self._calculate_consumer_transformer_mapping()
         self._calculate_transformer_loads(consumer_to_transformers)
         self._calculate_substation_loads()
+        self._infra_dirty = False
     
     def _calculate_consumer_transformer_mapping(self) -> Dict[int, List[Tuple[int, float, Any]]]:
         """
@@ -333,8 +350,8 @@ class GridSimulator:
         """
         consumer_to_transformers = {}
         
-        for consumer in self.graph.nodes.values():
-            if not consumer.active or consumer.type != NodeType.CONSUMER:
+        for consumer in self.graph.get_nodes_by_type(NodeType.CONSUMER):
+            if not consumer.active:
                 continue
             
             consumer_load = consumer.current_load
@@ -342,6 +359,7 @@ class GridSimulator:
                 continue
             
             transformers_serving = []  # Lista de (transformer_id, load_portion, edge)
+            serving_index = {}  # transformer_id -> posição da primeira entrada em transformers_serving
             total_allocated = 0.0
             
             # Busca todos os transformadores conectados a este consumidor
@@ -352,6 +370,7 @@ class GridSimulator:
                 if transformer_to_consumer_edge:
                     if transformer_to_consumer_edge.current_flow > 0:
                         load_portion = min(transformer_to_consumer_edge.current_flow, consumer_load)
+                        serving_index.setdefault(transformer.id, len(transformers_serving))
                         transformers_serving.append((transformer.id, load_portion, transformer_to_consumer_edge))
                         total_allocated += load_portion
             
@@ -359,13 +378,8 @@ class GridSimulator:
                 parent_transformer = self.graph.get_node(consumer.parent_id) if consumer.parent_id else None
                 
                 if parent_transformer and parent_transformer.active:
-                    parent_in_list = False
-                    parent_index = -1
-                    for i, (t_id, _, _) in enumerate(transformers_serving):
-                        if t_id == parent_transformer.id:
-                            parent_in_list = True
-                            parent_index = i
-                            break
+                    parent_index = serving_index.get(parent_transformer.id, -1)
+                    parent_in_list = parent_index >= 0
                     
                     if parent_in_list:
                         _, old_portion, edge = transformers_serving[parent_index]
@@ -403,26 +417,32 @@ class GridSimulator:
         Args:
             consumer_to_transformers: Mapeamento de consumidores para transformadores
         """
-        for transformer in self.graph.nodes.values():
-            if not transformer.active or transformer.type != NodeType.TRANSFORMER:
+        # Uma única passada pelo mapeamento acumula carga e perdas por transformador
+        # (antes: para cada transformador, uma varredura de todos os consumidores)
+        children_load_by_transformer: Dict[int, float] = {}
+        cable_losses_by_transformer: Dict[int, float] = {}
+        for consumer_id, transformers_serving in consumer_to_transformers.items():
+            consumer = self.graph.get_node(consumer_id)
+            if not consumer or not consumer.active:
                 continue
             
-            total_children_load = 0.0
-            cable_losses = 0.0
+            counted = set()
+            for t_id, load_portion, edge in transformers_serving:
+                if t_id in counted:
+                    continue  # Só a primeira parcela de cada transformador é contada
+                counted.add(t_id)
+                load_portion = min(load_portion, consumer.current_load)
+                children_load_by_transformer[t_id] = children_load_by_transformer.get(t_id, 0.0) + load_portion
+                current_amperes = load_portion / 220.0 if load_portion > 0 else 0.0
+                loss = edge.calculate_power_loss(current_amperes) / 1000.0
+                cable_losses_by_transformer[t_id] = cable_losses_by_transformer.get(t_id, 0.0) + loss
+        
+        for transformer in self.graph.get_nodes_by_type(NodeType.TRANSFORMER):
+            if not transformer.active:
+                continue
             
-            for consumer_id, transformers_serving in consumer_to_transformers.items():
-                consumer = self.graph.get_node(consumer_id)
-                if not consumer or not consumer.active:
-                    continue
-                
-                for t_id, load_portion, edge in transformers_serving:
-                    if t_id == transformer.id:
-                        load_portion = min(load_portion, consumer.current_load)
-                        total_children_load += load_portion
-                        current_amperes = load_portion / 220.0 if load_portion > 0 else 0.0
-                        loss = edge.calculate_power_loss(current_amperes) / 1000.0
-                        cable_losses += loss
-                        break
+            total_children_load = children_load_by_transformer.get(transformer.id, 0.0)
+            cable_losses = cable_losses_by_transformer.get(transformer.id, 0.0)
             
             transformer_losses = total_children_load * 0.05 if total_children_load > 0 else 0.0
             calculated_load = total_children_load + transformer_losses + cable_losses
@@ -437,8 +457,8 @@ class GridSimulator:
         """
         Calcula e atualiza as cargas das subestações baseado nos transformadores filhos.
         """
-        for substation in self.graph.nodes.values():
-            if not substation.active or substation.type != NodeType.SUBSTATION:
+        for substation in self.graph.get_nodes_by_type(NodeType.SUBSTATION):
+            if not substation.active:
                 continue
             
             children = self.graph.get_children(substation.id)
@@ -460,44 +480,56 @@ class GridSimulator:
                 if abs(calculated_load - old_load) > 10.0:
                     self.log(f"[INFRA] Sub{substation.id} atualizado: {calculated_load:.1f}kW (antes: {old_load:.1f}kW)")
     
-    def _ensure_all_consumers_have_transformer(self):
+    def _prepare_consumer_assignments(self):
         """
-        Garante que TODOS os consumidores ativos tenham um transformador responsável.
-        Se um consumidor não tem parent_id ou o parent_id não é válido, 
-        escolhe o melhor transformador baseado em eficiência.
+        Passada única pelos consumidores ativos antes do cálculo das cargas:
+        garante um transformador responsável e valida a distribuição proporcional de cada um.
+        Os transformadores conectados são buscados uma vez e usados pelas duas etapas.
         """
-        for consumer in self.graph.nodes.values():
-            if not consumer.active or consumer.type != NodeType.CONSUMER:
+        for consumer in self.graph.get_nodes_by_type(NodeType.CONSUMER):
+            if not consumer.active:
                 continue
             
-            # Verifica se o consumidor já tem um transformador válido como parent_id
-            has_valid_parent = False
-            if consumer.parent_id:
-                parent = self.graph.get_node(consumer.parent_id)
-                if parent and parent.active and parent.type == NodeType.TRANSFORMER:
-                    # Verifica se há conexão física
-                    edge = self._get_transformer_consumer_edge(consumer.parent_id, consumer.id)
-                    if edge:
-                        has_valid_parent = True
-            
-            # Se não tem parent válido, busca o MELHOR transformador conectado baseado em eficiência
-            if not has_valid_parent:
-                connected_transformers = self._get_connected_transformers(consumer.id)
+            connected_transformers = self._get_connected_transformers(consumer.id)
+            self._ensure_consumer_has_transformer(consumer, connected_transformers)
+            self._validate_consumer_distribution(consumer, connected_transformers)
+    
+    def _ensure_consumer_has_transformer(self, consumer: PowerNode, connected_transformers: List[Tuple[PowerNode, Any]]):
+        """
+        Garante que o consumidor ativo tenha um transformador responsável.
+        Se o consumidor não tem parent_id ou o parent_id não é válido, 
+        escolhe o melhor transformador baseado em eficiência.
+        
+        Args:
+            consumer: Consumidor ativo
+            connected_transformers: Transformadores ativos conectados ao consumidor
+        """
+        # Verifica se o consumidor já tem um transformador válido como parent_id
+        has_valid_parent = False
+        if consumer.parent_id:
+            parent = self.graph.get_node(consumer.parent_id)
+            if parent and parent.active and parent.type == NodeType.TRANSFORMER:
+                # Verifica se há conexão física
+                edge = self._get_transformer_consumer_edge(consumer.parent_id, consumer.id)
+                if edge:
+                    has_valid_parent = True
+        
+        # Se não tem parent válido, busca o MELHOR transformador conectado baseado em eficiência
+        if not has_valid_parent:
+            if connected_transformers:
+                candidate_transformers = [
+                    (transformer, transformer.efficiency * edge.efficiency, edge)
+                    for transformer, edge in connected_transformers
+                ]
+                # Só o melhor interessa: max() é O(n) e, no empate, mantém o primeiro (como a ordenação estável)
+                best_transformer, best_score, _ = max(candidate_transformers, key=lambda x: x[1])
+                consumer.parent_id = best_transformer.id
                 
-                if connected_transformers:
-                    candidate_transformers = [
-                        (transformer, transformer.efficiency * edge.efficiency, edge)
-                        for transformer, edge in connected_transformers
-                    ]
-                    candidate_transformers.sort(key=lambda x: x[1], reverse=True)
-                    best_transformer, best_score, _ = candidate_transformers[0]
-                    consumer.parent_id = best_transformer.id
-                    
-                    if len(candidate_transformers) > 1:
-                        self.log(
-                            f"[OTIMIZAÇÃO] Consumidor {consumer.id} atribuído ao T{best_transformer.id} "
-                            f"(eficiência: {best_transformer.efficiency:.3f}, score: {best_score:.3f})"
-                        )
+                if len(candidate_transformers) > 1:
+                    self.log(
+                        f"[OTIMIZAÇÃO] Consumidor {consumer.id} atribuído ao T{best_transformer.id} "
+                        f"(eficiência: {best_transformer.efficiency:.3f}, score: {best_score:.3f})"
+                    )
     
     def optimize_initial_transformer_assignment(self) -> List[str]:
         """
@@ -508,32 +540,30 @@ class GridSimulator:
             Lista de mensagens sobre as otimizações realizadas
         """
         logs = []
-        from src.core.algorithms.heuristics import EnergyHeuristics
         
         current_efficiency = EnergyHeuristics.calculate_global_efficiency(self.graph)
         logs.append(f"[OTIMIZAÇÃO INICIAL] Eficiência global atual: {current_efficiency:.2f}")
         
         optimized_count = 0
-        for consumer in self.graph.nodes.values():
-            if not consumer.active or consumer.type != NodeType.CONSUMER:
+        for consumer in self.graph.get_nodes_by_type(NodeType.CONSUMER):
+            if not consumer.active:
                 continue
             
             candidate_transformers = []
             connected_transformers = self._get_connected_transformers(consumer.id)
             
-            for transformer, edge in connected_transformers:
-                old_parent_id = consumer.parent_id
-                consumer.parent_id = transformer.id
-                simulated_efficiency = EnergyHeuristics.calculate_global_efficiency(self.graph)
-                consumer.parent_id = old_parent_id
+            # Eficiência global simulada para cada transformador candidato como pai
+            simulated_efficiencies = EnergyHeuristics.calculate_global_efficiency_for_parents(
+                self.graph, consumer, [transformer.id for transformer, _ in connected_transformers]
+            )
+            for (transformer, edge), simulated_efficiency in zip(connected_transformers, simulated_efficiencies):
                 score = (simulated_efficiency / 1000.0) * 0.7 + (transformer.efficiency * edge.efficiency) * 0.3
                 candidate_transformers.append((transformer, score, simulated_efficiency, edge))
             
             if not candidate_transformers:
                 continue
             
-            candidate_transformers.sort(key=lambda x: x[1], reverse=True)
-            best_transformer, best_score, best_efficiency, best_edge = candidate_transformers[0]
+            best_transformer, best_score, best_efficiency, best_edge = max(candidate_transformers, key=lambda x: x[1])
             
             if consumer.parent_id != best_transformer.id:
                 old_parent_id = consumer.parent_id
@@ -570,7 +600,6 @@ class GridSimulator:
             Lista de mensagens sobre as otimizações realizadas
         """
         logs = []
-        from src.core.algorithms.heuristics import EnergyHeuristics
         
         newly_reactivated_transformer = self.graph.get_node(newly_reactivated_transformer_id)
         if not newly_reactivated_transformer or not newly_reactivated_transformer.active:
@@ -578,8 +607,8 @@ class GridSimulator:
         
         # Para cada consumidor ativo na rede, verifica se pode ser melhor atendido pelo transformador reativado
         optimized_count = 0
-        for consumer in self.graph.nodes.values():
-            if not consumer.active or consumer.type != NodeType.CONSUMER:
+        for consumer in self.graph.get_nodes_by_type(NodeType.CONSUMER):
+            if not consumer.active:
                 continue
             
             # Verifica se o consumidor está conectado ao transformador reativado
@@ -594,17 +623,13 @@ class GridSimulator:
             # Busca todos os transformadores conectados e ativos para este consumidor
             candidate_transformers = []
             
-            for transformer, edge in connected_transformers:
-                # Simula atribuir este consumidor a este transformador
-                old_parent_id = consumer.parent_id
-                consumer.parent_id = transformer.id
-                
-                # Calcula eficiência global com esta atribuição
-                simulated_efficiency = EnergyHeuristics.calculate_global_efficiency(self.graph)
-                
-                # Restaura parent_id original
-                consumer.parent_id = old_parent_id
-                
+            # Simula atribuir este consumidor a cada transformador e calcula a eficiência global
+            # (só as arestas do consumidor são recalculadas por candidato; o grafo não é alterado)
+            simulated_efficiencies = EnergyHeuristics.calculate_global_efficiency_for_parents(
+                self.graph, consumer, [transformer.id for transformer, _ in connected_transformers]
+            )
+            
+            for (transformer, edge), simulated_efficiency in zip(connected_transformers, simulated_efficiencies):
                 # Score considera eficiência global e eficiências individuais
                 score = (simulated_efficiency / 1000.0) * 0.7 + (transformer.efficiency * edge.efficiency) * 0.3
                 candidate_transformers.append((transformer, score, simulated_efficiency, edge))
@@ -612,9 +637,8 @@ class GridSimulator:
             if not candidate_transformers:
                 continue
             
-            # Ordena por score (maior primeiro) - escolhe o melhor transformador
-            candidate_transformers.sort(key=lambda x: x[1], reverse=True)
-            best_transformer, best_score, best_efficiency, best_edge = candidate_transformers[0]
+            # Escolhe o melhor transformador (maior score; no empate, o primeiro candidato)
+            best_transformer, best_score, best_efficiency, best_edge = max(candidate_transformers, key=lambda x: x[1])
             
             # Se o melhor transformador é diferente do atual, reatribui
             if consumer.parent_id != best_transformer.id:
@@ -630,112 +654,105 @@ class GridSimulator:
         
         return logs
     
-    def _validate_proportional_distributions(self):
+    def _validate_consumer_distribution(self, consumer: PowerNode, connected_transformers: List[Tuple[PowerNode, Any]]):
         """
-        Valida e corrige distribuições proporcionais para evitar duplicação de cargas.
+        Valida e corrige a distribuição proporcional de um consumidor para evitar duplicação de cargas.
+        
+        Args:
+            consumer: Consumidor ativo
+            connected_transformers: Transformadores ativos conectados ao consumidor
         """
-        # Para cada consumidor ativo, verifica se há distribuição proporcional
-        for consumer in self.graph.nodes.values():
-            if not consumer.active or consumer.type != NodeType.CONSUMER:
-                continue
-            
-            consumer_load = consumer.current_load
-            # Busca todos os transformadores conectados a este consumidor
-            connected_transformers = self._get_connected_transformers(consumer.id)
-            
-            if consumer_load <= 0:
-                # Zera todos os edge.current_flow para consumidores sem carga
-                for transformer, _ in connected_transformers:
-                    transformer_to_consumer_edge = self._get_transformer_consumer_edge(transformer.id, consumer.id)
-                    if transformer_to_consumer_edge:
-                        transformer_to_consumer_edge.current_flow = 0.0
-                continue
-            transformers_with_flow = []  # Lista de (transformer_id, edge, current_flow)
-            total_flow = 0.0
-            
+        consumer_load = consumer.current_load
+        
+        if consumer_load <= 0:
+            # Zera todos os edge.current_flow para consumidores sem carga
             for transformer, _ in connected_transformers:
-                # Busca a aresta na direção transformador → consumidor
                 transformer_to_consumer_edge = self._get_transformer_consumer_edge(transformer.id, consumer.id)
-                
-                if transformer_to_consumer_edge and transformer_to_consumer_edge.current_flow > 0:
-                    # Limita o current_flow ao máximo da carga do consumidor
-                    transformer_to_consumer_edge.current_flow = min(
-                        transformer_to_consumer_edge.current_flow, 
-                        consumer_load
-                    )
-                    transformers_with_flow.append((transformer.id, transformer_to_consumer_edge, transformer_to_consumer_edge.current_flow))
-                    total_flow += transformer_to_consumer_edge.current_flow
+                if transformer_to_consumer_edge:
+                    transformer_to_consumer_edge.current_flow = 0.0
+            return
+        transformers_with_flow = []  # Lista de (transformer_id, edge, current_flow)
+        flow_by_transformer = {}  # transformer_id -> (edge, current_flow) da primeira entrada, para busca O(1)
+        total_flow = 0.0
+        
+        for transformer, _ in connected_transformers:
+            # Busca a aresta na direção transformador → consumidor
+            transformer_to_consumer_edge = self._get_transformer_consumer_edge(transformer.id, consumer.id)
             
-            # Se não há redistribuição (edge.current_flow), garante que o parent_id esteja correto
-            if not transformers_with_flow:
-                # Sem redistribuição, o transformador pai deve fornecer toda a carga
-                parent_transformer = self.graph.get_node(consumer.parent_id) if consumer.parent_id else None
+            if transformer_to_consumer_edge and transformer_to_consumer_edge.current_flow > 0:
+                # Limita o current_flow ao máximo da carga do consumidor
+                transformer_to_consumer_edge.current_flow = min(
+                    transformer_to_consumer_edge.current_flow, 
+                    consumer_load
+                )
+                transformers_with_flow.append((transformer.id, transformer_to_consumer_edge, transformer_to_consumer_edge.current_flow))
+                flow_by_transformer.setdefault(transformer.id, (transformer_to_consumer_edge, transformer_to_consumer_edge.current_flow))
+                total_flow += transformer_to_consumer_edge.current_flow
+        
+        # Se não há redistribuição (edge.current_flow), garante que o parent_id esteja correto
+        if not transformers_with_flow:
+            # Sem redistribuição, o transformador pai deve fornecer toda a carga
+            parent_transformer = self.graph.get_node(consumer.parent_id) if consumer.parent_id else None
+            
+            if not parent_transformer or not parent_transformer.active:
+                # Se não tem parent válido, usa o primeiro transformador conectado
+                if connected_transformers:
+                    consumer.parent_id = connected_transformers[0][0].id
+        else:
+            # Há redistribuição proporcional - valida se a soma está correta
+            # Tolerância de 1% para erros de ponto flutuante
+            tolerance = max(consumer_load * 0.01, 0.1)  # Mínimo de 0.1kW
+            if abs(total_flow - consumer_load) > tolerance:
+                # Se a soma está maior que a carga, reduz proporcionalmente
+                if total_flow > consumer_load:
+                    scale_factor = consumer_load / total_flow if total_flow > 0 else 0.0
+                    for transformer_id, edge, old_flow in transformers_with_flow:
+                        new_flow = old_flow * scale_factor
+                        edge.current_flow = new_flow
                 
-                if not parent_transformer or not parent_transformer.active:
-                    # Se não tem parent válido, busca o primeiro transformador conectado
-                    connected_transformers = self._get_connected_transformers(consumer.id)
-                    if connected_transformers:
-                        consumer.parent_id = connected_transformers[0][0].id
-                        break
-            else:
-                # Há redistribuição proporcional - valida se a soma está correta
-                # Tolerância de 1% para erros de ponto flutuante
-                tolerance = max(consumer_load * 0.01, 0.1)  # Mínimo de 0.1kW
-                if abs(total_flow - consumer_load) > tolerance:
-                    # Se a soma está maior que a carga, reduz proporcionalmente
-                    if total_flow > consumer_load:
-                        scale_factor = consumer_load / total_flow if total_flow > 0 else 0.0
-                        for transformer_id, edge, old_flow in transformers_with_flow:
-                            new_flow = old_flow * scale_factor
-                            edge.current_flow = new_flow
+                # Se a soma está menor que a carga, o transformador pai hierárquico deve fornecer o restante
+                elif total_flow < consumer_load:
+                    # Encontra o transformador pai hierárquico
+                    parent_transformer = self.graph.get_node(consumer.parent_id) if consumer.parent_id else None
                     
-                    # Se a soma está menor que a carga, o transformador pai hierárquico deve fornecer o restante
-                    elif total_flow < consumer_load:
-                        # Encontra o transformador pai hierárquico
-                        parent_transformer = self.graph.get_node(consumer.parent_id) if consumer.parent_id else None
+                    if parent_transformer and parent_transformer.active:
+                        # Verifica se o pai já está na lista de redistribuição
+                        parent_entry = flow_by_transformer.get(parent_transformer.id)
                         
-                        if parent_transformer and parent_transformer.active:
-                            # Verifica se o pai já está na lista de redistribuição
-                            parent_in_list = any(t_id == parent_transformer.id for t_id, _, _ in transformers_with_flow)
-                            
-                            if not parent_in_list:
-                                # Ajusta o edge.current_flow do transformador pai para incluir a diferença
-                                parent_edge = self.graph.get_edge_obj(parent_transformer.id, consumer.id)
-                                if parent_edge:
-                                    remaining_load = consumer_load - total_flow
-                                    parent_edge.current_flow = remaining_load
-                            else:
-                                # Pai já está na lista, ajusta proporcionalmente
-                                # Encontra a entrada do pai na lista
-                                for i, (t_id, edge, flow) in enumerate(transformers_with_flow):
-                                    if t_id == parent_transformer.id:
-                                        remaining_load = consumer_load - total_flow
-                                        edge.current_flow = flow + remaining_load
-                                        break
-    
+                        if parent_entry is None:
+                            # Ajusta o edge.current_flow do transformador pai para incluir a diferença
+                            parent_edge = self.graph.get_edge_obj(parent_transformer.id, consumer.id)
+                            if parent_edge:
+                                remaining_load = consumer_load - total_flow
+                                parent_edge.current_flow = remaining_load
+                        else:
+                            # Pai já está na lista, ajusta proporcionalmente
+                            edge, flow = parent_entry
+                            remaining_load = consumer_load - total_flow
+                            edge.current_flow = flow + remaining_load
+
     def _simulate_random_fluctuations(self):
         """
         Gera dados para os sensores (FALLBACK - não deve ser usado se IoT estiver ativo).
         CORRIGIDO: Valores mais realistas.
         """
-        for node in self.graph.nodes.values():
-            if not node.active:
-                continue
-
-            if node.type == NodeType.CONSUMER:
-                if node.manual_load:
-                    continue  # Não sobrescreve carga manual
-                
-                hour = self.time_tick % 24
-                if 6 <= hour <= 22:  # Dia
-                    base = node.max_capacity * random.uniform(0.4, 0.8)
-                else:  # Noite
-                    base = node.max_capacity * random.uniform(0.1, 0.3)
-                
-                # Aplica pequena variação
-                variation = random.uniform(0.95, 1.05)
-                new_load = base * variation
-                node.update_load(new_load)
+        # Faixa de carga depende só do tick: calculada uma vez, fora do laço
+        hour = self.time_tick % 24
+        if 6 <= hour <= 22:  # Dia
+            low, span = 0.4, 0.4
+        else:  # Noite
+            low, span = 0.1, 0.2
+        
+        # random.uniform(a, b) == a + (b - a) * random(): mesma sequência, sem a chamada extra
+        rand = random.random
+        for node in self.graph.get_nodes_by_type(NodeType.CONSUMER):
+            if not node.active or node.manual_load:
+                continue  # Não sobrescreve carga manual
+            
+            base = node.max_capacity * (low + span * rand())
+            # Aplica pequena variação
+            variation = 0.95 + 0.1 * rand()
+            node.update_load(base * variation)
         
         # Atualiza infraestrutura após atualizar consumidores
         self._update_infrastructure_loads()
@@ -758,30 +775,22 @@ class GridSimulator:
         for node_id, event_type in events_to_remove:
             self.event_queue.remove_event(node_id, event_type)
         
-        for node in self.graph.nodes.values():
-            if not node.active or node.type not in [NodeType.TRANSFORMER, NodeType.SUBSTATION]:
+        infrastructure = self.graph.get_nodes_by_type(NodeType.TRANSFORMER) + self.graph.get_nodes_by_type(NodeType.SUBSTATION)
+        for node in infrastructure:
+            if not node.active:
                 continue
             
             if node.is_overloaded:
                 overload_ratio = node.current_load / node.max_capacity if node.max_capacity > 0 else 1.0
                 
-                if overload_ratio >= 1.5:
-                    priority = PriorityLevel.CRITICAL
-                    severity_msg = "CRÍTICA"
-                elif overload_ratio >= 1.2:
-                    priority = PriorityLevel.HIGH
-                    severity_msg = "ALTA"
-                elif overload_ratio >= 1.0:
-                    priority = PriorityLevel.MEDIUM
-                    severity_msg = "MÉDIA"
-                else:
+                # Busca binária na tabela de faixas em vez da cadeia de if/elif
+                level = bisect_right(self.OVERLOAD_THRESHOLDS, overload_ratio) - 1
+                if level < 0:
                     continue
+                priority, severity_msg = self.OVERLOAD_LEVELS[level]
                 
-                existing_event = None
-                for event in self.event_queue.get_all_events():
-                    if event.node_id == node.id and event.event_type == EventType.OVERLOAD_WARNING:
-                        existing_event = event
-                        break
+                # Consulta O(1) pelo índice da fila em vez de varrer todos os eventos por nó
+                existing_event = self.event_queue.get_event(node.id, EventType.OVERLOAD_WARNING)
                 
                 if existing_event:
                     if existing_event.priority != priority:
@@ -790,7 +799,7 @@ class GridSimulator:
                 else:
                     evt = GridEvent(
                         priority=priority,
-                        timestamp=datetime.now(),
+                        timestamp=self.time_tick,
                         event_type=EventType.OVERLOAD_WARNING,
                         node_id=node.id,
                         payload={
@@ -813,8 +822,8 @@ class GridSimulator:
         
         # Primeiro, identifica transformadores que estão em ou acima de 150% de uso
         critical_transformers = []
-        for transformer in self.graph.nodes.values():
-            if not transformer.active or transformer.type != NodeType.TRANSFORMER:
+        for transformer in self.graph.get_nodes_by_type(NodeType.TRANSFORMER):
+            if not transformer.active:
                 continue
             
             load_percentage = transformer.load_percentage
@@ -890,6 +899,7 @@ class GridSimulator:
                     )
         
         # Desativa APENAS os consumidores identificados como anormais
+        deactivation_events = []
         for consumer, transformer, transformer_load_pct, impact_pct, consumer_overload_ratio in nodes_to_deactivate:
             if consumer.active:  # Verifica novamente antes de desativar
                 self._deactivate_consumer(consumer)
@@ -903,7 +913,7 @@ class GridSimulator:
                 # Cria evento para notificar a desativação automática
                 evt = GridEvent(
                     priority=PriorityLevel.CRITICAL,
-                    timestamp=datetime.now(),
+                    timestamp=self.time_tick,
                     event_type=EventType.NODE_FAILURE,
                     node_id=consumer.id,
                     payload={
@@ -917,7 +927,10 @@ class GridSimulator:
                         'impact_percentage': impact_pct
                     }
                 )
-                self.event_queue.push(evt, check_duplicates=True)
+                deactivation_events.append(evt)
+        
+        # Notificações inseridas na fila numa única chamada
+        self.event_queue.push_many(deactivation_events, check_duplicates=True)
         
         # Atualiza cargas da infraestrutura após desativações
         if nodes_to_deactivate:
@@ -933,42 +946,46 @@ class GridSimulator:
         """
         self.log(f"Evento: {event}")
         
-        if event.event_type == EventType.OVERLOAD_WARNING:
-            # IA Detectou risco -> Tentar balancear
-            node = self.graph.get_node(event.node_id)
-            if node:
-                logs = self.balancer.update_node_load(event.node_id, event.payload.get('predicted_load', node.current_load))
-                for l in logs: self.log(l)
-                
-                # Verifica se o problema ainda existe (sobrecarga)
-                # Mantém o evento na fila se o nó ainda está sobrecarregado
-                if node.is_overloaded:
-                    return True  # Mantém na fila - problema ainda existe
-                else:
-                    self.log(f"Problema resolvido: Nó {event.node_id} não está mais sobrecarregado")
-                    return False  # Remove da fila - problema resolvido
-            return False
-            
-        elif event.event_type == EventType.NODE_FAILURE:
-            # Falha crítica -> Verifica se o nó ainda está inativo
-            node = self.graph.get_node(event.node_id)
-            if node:
-                # Se o nó já está desativado, apenas loga (já foi processado antes)
-                if not node.active:
-                    # Mantém o evento na fila enquanto o nó estiver inativo
-                    return True  # Mantém na fila - problema ainda existe (nó inativo)
-                else:
-                    self.log(f"Problema resolvido: Nó {event.node_id} foi reativado")
-                    return False  # Remove da fila - problema resolvido (nó reativado)
-            return False  # Nó não existe mais - remove evento
-            
-        elif event.event_type == EventType.MAINTENANCE:
-            # Eventos de manutenção são únicos - processa e remove
+        # Despacho por tabela montada no __init__; tipos sem tratador são únicos - processa e remove
+        handler = self._event_handlers.get(event.event_type)
+        if handler is None:
             return False
+        return handler(event)
+
+    def _on_overload_warning(self, event: GridEvent) -> bool:
+        """Alerta de sobrecarga: tenta balancear e mantém o evento enquanto o nó seguir sobrecarregado."""
+        # IA Detectou risco -> Tentar balancear
+        node = self.graph.get_node(event.node_id)
+        if node:
+            logs = self.balancer.update_node_load(event.node_id, event.payload.get('predicted_load', node.current_load))
+            for l in logs: self.log(l)
             
-        else:
-            # Outros tipos de eventos são únicos - processa e remove
-            return False
+            # Verifica se o problema ainda existe (sobrecarga)
+            # Mantém o evento na fila se o nó ainda está sobrecarregado
+            if node.is_overloaded:
+                return True  # Mantém na fila - problema ainda existe
+            else:
+                self.log(f"Problema resolvido: Nó {event.node_id} não está mais sobrecarregado")
+                return False  # Remove da fila - problema resolvido
+        return False
+
+    def _on_node_failure(self, event: GridEvent) -> bool:
+        """Falha de nó: mantém o evento na fila enquanto o nó estiver inativo."""
+        # Falha crítica -> Verifica se o nó ainda está inativo
+        node = self.graph.get_node(event.node_id)
+        if node:
+            # Se o nó já está desativado, apenas loga (já foi processado antes)
+            if not node.active:
+                # Mantém o evento na fila enquanto o nó estiver inativo
+                return True  # Mantém na fila - problema ainda existe (nó inativo)
+            else:
+                self.log(f"Problema resolvido: Nó {event.node_id} foi reativado")
+                return False  # Remove da fila - problema resolvido (nó reativado)
+        return False  # Nó não existe mais - remove evento
+
+    def _on_maintenance(self, event: GridEvent) -> bool:
+        """Eventos de manutenção são únicos - processa e remove."""
+        return False
 
     def inject_failure(self, node_id: int):
         """
@@ -997,7 +1014,7 @@ class GridSimulator:
         # Criar evento CRITICAL na fila para notificar a falha
         evt = GridEvent(
             priority=PriorityLevel.CRITICAL,
-            timestamp=datetime.now(),
+            timestamp=self.time_tick,
             event_type=EventType.NODE_FAILURE,
             node_id=node_id,
             payload={'node_type': str(node_type), 'msg': f'Falha crítica no nó {node_id}'}
@@ -1043,7 +1060,7 @@ class GridSimulator:
         # Criar evento MEDIUM na fila para notificar a reativação/manutenção
         evt = GridEvent(
             priority=PriorityLevel.MEDIUM,
-            timestamp=datetime.now(),
+            timestamp=self.time_tick,
             event_type=EventType.MAINTENANCE,
             node_id=node_id,
             payload={'node_type': str(node_type), 'msg': f'Nó {node_id} reativado'}
@@ -1070,40 +1087,27 @@ class GridSimulator:
         Returns:
             Tupla (melhor_transformador, foi_otimizado)
         """
-        from src.core.algorithms.heuristics import EnergyHeuristics
-        
         connected_transformers = self._get_connected_transformers(consumer.id)
         candidate_transformers = []
         
-        for transformer, edge in connected_transformers:
-            # Simula atribuir este consumidor a este transformador
-            old_parent_id = consumer.parent_id
-            old_parent = self.graph.get_node(old_parent_id) if old_parent_id else None
-            
-            # Salva cargas atuais dos transformadores
-            old_neighbor_load = transformer.current_load
-            old_parent_load = old_parent.current_load if old_parent and old_parent.active else 0.0
-            
-            # Simula a atribuição
-            consumer.parent_id = transformer.id
-            
-            # Atualiza temporariamente as cargas dos transformadores
+        old_parent_id = consumer.parent_id
+        old_parent = self.graph.get_node(old_parent_id) if old_parent_id else None
+        
+        # Para cada candidato, simula a atribuição: o pai atual perde a carga do consumidor
+        # (com perdas de 5%) e o candidato a recebe
+        load_overrides = []
+        for transformer, _ in connected_transformers:
+            simulated_loads = {}
             if old_parent and old_parent.active and old_parent.type == NodeType.TRANSFORMER:
-                simulated_old_parent_load = max(0.0, old_parent_load - consumer.current_load * 1.05)
-                old_parent.current_load = simulated_old_parent_load
-            
-            simulated_neighbor_load = old_neighbor_load + consumer.current_load * 1.05
-            transformer.current_load = simulated_neighbor_load
-            
-            # Calcula eficiência global com esta atribuição
-            simulated_efficiency = EnergyHeuristics.calculate_global_efficiency(self.graph)
-            
-            # Restaura estado original
-            consumer.parent_id = old_parent_id
-            transformer.current_load = old_neighbor_load
-            if old_parent and old_parent.active:
-                old_parent.current_load = old_parent_load
-            
+                simulated_loads[old_parent.id] = max(0.0, old_parent.current_load - consumer.current_load * 1.05)
+            simulated_loads[transformer.id] = transformer.current_load + consumer.current_load * 1.05
+            load_overrides.append(simulated_loads)
+        
+        # Eficiência global com cada atribuição, sem varrer o grafo inteiro por candidato
+        simulated_efficiencies = EnergyHeuristics.calculate_global_efficiency_for_parents(
+            self.graph, consumer, [transformer.id for transformer, _ in connected_transformers], load_overrides
+        )
+        for (transformer, edge), simulated_efficiency in zip(connected_transformers, simulated_efficiencies):
             # Score considera eficiência global e eficiências individuais
             score = (simulated_efficiency / 1000.0) * 0.7 + (transformer.efficiency * edge.efficiency) * 0.3
             candidate_transformers.append((transformer, score, simulated_efficiency, edge))
@@ -1111,9 +1115,8 @@ class GridSimulator:
         if not candidate_transformers:
             return None, False
         
-        # Ordena por score (maior primeiro) - escolhe o melhor transformador
-        candidate_transformers.sort(key=lambda x: x[1], reverse=True)
-        best_transformer, best_score, best_efficiency, _ = candidate_transformers[0]
+        # Escolhe o melhor transformador (maior score; no empate, o primeiro candidato)
+        best_transformer, best_score, best_efficiency, _ = max(candidate_transformers, key=lambda x: x[1])
         
         # Atribui ao melhor transformador
         old_parent_id = consumer.parent_id
@@ -1149,8 +1152,6 @@ class GridSimulator:
         """
         Reativa um transformador e otimiza atribuição de consumidores baseado em eficiência global.
         """
-        from src.core.algorithms.heuristics import EnergyHeuristics
-        
         transformer_id = transformer.id
         transformer.active = True
         
@@ -1166,8 +1167,10 @@ class GridSimulator:
         for consumer in all_consumers:
             # Se o consumidor está inativo, reativa apenas se não há outros transformadores ativos
             if not consumer.active:
-                connected_transformers = self._get_connected_transformers(consumer.id)
-                has_active_transformer = any(t.active for t, _ in connected_transformers)
+                # Para no primeiro transformador ativo, sem montar a lista filtrada de conectados
+                has_active_transformer = any(
+                    t.active for t, _ in self.graph.get_neighbors_by_type(consumer.id, NodeType.TRANSFORMER)
+                )
                 
                 if not has_active_transformer:
                     consumer.active = True
@@ -1236,14 +1239,10 @@ class GridSimulator:
         
         for transformer in transformer_children:
             if not transformer.active:
-                edges = self.graph.get_neighbors(transformer.id)
-                has_active_substation = False
-                for edge in edges:
-                    neighbor_id = edge.target if edge.source == transformer.id else edge.source
-                    neighbor = self.graph.get_node(neighbor_id)
-                    if neighbor and neighbor.active and neighbor.type == NodeType.SUBSTATION:
-                        has_active_substation = True
-                        break
+                has_active_substation = any(
+                    neighbor.active
+                    for neighbor, _ in self.graph.get_neighbors_by_type(transformer.id, NodeType.SUBSTATION)
+                )
                 
                 if not has_active_substation:
                     transformer.active = True
@@ -1406,20 +1405,17 @@ class GridSimulator:
         if not transformer:
             return consumers
         
-        # Busca consumidores conectados via arestas
-        edges = self.graph.get_neighbors(transformer_id)
+        # Busca consumidores conectados via arestas (vizinhança por tipo vem do cache do grafo)
+        seen_ids = set()
         
-        for edge in edges:
-            neighbor_id = edge.target if edge.source == transformer_id else edge.source
-            neighbor = self.graph.get_node(neighbor_id)
-            
-            if neighbor and neighbor.type == NodeType.CONSUMER:
-                # Verifica se este consumidor estava sendo alimentado por este transformador
-                # (seja por hierarquia ou por edge.current_flow > 0)
-                if (neighbor.parent_id == transformer_id or 
-                    (edge.current_flow > 0 and edge.source == transformer_id)):
-                    if neighbor not in consumers:
-                        consumers.append(neighbor)
+        for neighbor, edge in self.graph.get_neighbors_by_type(transformer_id, NodeType.CONSUMER):
+            # Verifica se este consumidor estava sendo alimentado por este transformador
+            # (seja por hierarquia ou por edge.current_flow > 0)
+            if (neighbor.parent_id == transformer_id or 
+                (edge.current_flow > 0 and edge.source == transformer_id)):
+                if neighbor.id not in seen_ids:
+                    seen_ids.add(neighbor.id)
+                    consumers.append(neighbor)
         
         return consumers
     
@@ -1512,10 +1508,8 @@ class GridSimulator:
         """Encontra outras subestações ativas na rede."""
         alternatives = []
         
-        for node in self.graph.nodes.values():
-            if (node.active and 
-                node.type == NodeType.SUBSTATION and 
-                node.id != exclude_substation_id):
+        for node in self.graph.get_nodes_by_type(NodeType.SUBSTATION):
+            if node.active and node.id != exclude_substation_id:
                 alternatives.append(node)
         
         return alternatives
@@ -1528,19 +1522,16 @@ class GridSimulator:
         if not substation:
             return transformers
         
-        # Busca transformadores conectados via arestas ou hierarquia
-        edges = self.graph.get_neighbors(substation_id)
+        # Busca transformadores conectados via arestas ou hierarquia (vizinhança por tipo vem do cache do grafo)
+        seen_ids = set()
         
-        for edge in edges:
-            neighbor_id = edge.target if edge.source == substation_id else edge.source
-            neighbor = self.graph.get_node(neighbor_id)
-            
-            if neighbor and neighbor.type == NodeType.TRANSFORMER:
-                # Verifica se este transformador depende desta subestação
-                if (neighbor.parent_id == substation_id or 
-                    (edge.current_flow > 0 and edge.source == substation_id)):
-                    if neighbor not in transformers:
-                        transformers.append(neighbor)
+        for neighbor, edge in self.graph.get_neighbors_by_type(substation_id, NodeType.TRANSFORMER):
+            # Verifica se este transformador depende desta subestação
+            if (neighbor.parent_id == substation_id or 
+                (edge.current_flow > 0 and edge.source == substation_id)):
+                if neighbor.id not in seen_ids:
+                    seen_ids.add(neighbor.id)
+                    transformers.append(neighbor)
         
         return transformers
     
@@ -1576,7 +1567,29 @@ class GridSimulator:
         # Se não encontrou conexão física direta, não pode reconectar
         return False
 
-    def _recalculate_proportional_distribution(self, consumer: PowerNode, old_load: float):
+    def _get_transformer_flows(self, consumer_id: int) -> List[Tuple[Any, int, float]]:
+        """
+        Retorna as arestas T→C com fluxo de redistribuição ativo (edge.current_flow > 0)
+        dos transformadores ativos conectados a um consumidor.
+        
+        Args:
+            consumer_id: ID do consumidor
+            
+        Returns:
+            Lista de (aresta, transformer_id, current_flow), na ordem da vizinhança
+        """
+        transformers_with_flow = []
+        for transformer, _ in self._get_connected_transformers(consumer_id):
+            # Busca a aresta na direção TRANSFORMADOR → CONSUMIDOR
+            # porque é essa que tem o current_flow definido pelo LoadRedistributor
+            transformer_to_consumer_edge = self._get_transformer_consumer_edge(transformer.id, consumer_id)
+            
+            if transformer_to_consumer_edge and transformer_to_consumer_edge.current_flow > 0:
+                transformers_with_flow.append((transformer_to_consumer_edge, transformer.id, transformer_to_consumer_edge.current_flow))
+        return transformers_with_flow
+
+    def _recalculate_proportional_distribution(self, consumer: PowerNode, old_load: float,
+                                               transformers_with_flow: Optional[List[Tuple[Any, int, float]]] = None):
         """
         Recalcula os valores de edge.current_flow proporcionalmente quando a carga de um
         consumidor muda, mas ele já está sendo alimentado por múltiplos transformadores.
@@ -1585,23 +1598,16 @@ class GridSimulator:
         Args:
             consumer: O nó consumidor cuja carga mudou
             old_load: A carga anterior do consumidor (antes da mudança)
+            transformers_with_flow: Resultado de _get_transformer_flows, se o chamador já o tem
         """
         if consumer.type != NodeType.CONSUMER:
             return
         
-        # Busca transformadores conectados usando helper
-        connected_transformers = self._get_connected_transformers(consumer.id)
-        transformers_with_flow = []  # Lista de (edge, transformer_id, current_flow)
+        if transformers_with_flow is None:
+            transformers_with_flow = self._get_transformer_flows(consumer.id)
         total_old_flow = 0.0
-        
-        for transformer, _ in connected_transformers:
-            # Busca a aresta na direção TRANSFORMADOR → CONSUMIDOR
-            # porque é essa que tem o current_flow definido pelo LoadRedistributor
-            transformer_to_consumer_edge = self._get_transformer_consumer_edge(transformer.id, consumer.id)
-            
-            if transformer_to_consumer_edge and transformer_to_consumer_edge.current_flow > 0:
-                transformers_with_flow.append((transformer_to_consumer_edge, transformer.id, transformer_to_consumer_edge.current_flow))
-                total_old_flow += transformer_to_consumer_edge.current_flow
+        for _, _, flow in transformers_with_flow:
+            total_old_flow += flow
         
         # Se não há distribuição proporcional definida, não precisa recalcular
         if not transformers_with_flow or total_old_flow <= 0:
@@ -1644,17 +1650,12 @@ class GridSimulator:
             # Verifica DEPOIS de atualizar a carga, mas usa old_load para calcular a proporção
             if node.type == NodeType.CONSUMER:
                 # Verifica se há distribuição proporcional ativa (transformadores com edge.current_flow > 0)
-                connected_transformers = self._get_connected_transformers(node_id)
-                transformers_with_flow = []
-                
-                for transformer, _ in connected_transformers:
-                    transformer_to_consumer_edge = self._get_transformer_consumer_edge(transformer.id, node_id)
-                    if transformer_to_consumer_edge and transformer_to_consumer_edge.current_flow > 0:
-                        transformers_with_flow.append((transformer.id, transformer_to_consumer_edge.current_flow))
+                transformers_with_flow = self._get_transformer_flows(node_id)
                 
                 # Se há pelo menos um transformador com current_flow > 0, há redistribuição proporcional
                 if transformers_with_flow:
-                    self._recalculate_proportional_distribution(node, old_load)
+                    # Reaproveita as arestas já coletadas em vez de buscá-las de novo
+                    self._recalculate_proportional_distribution(node, old_load, transformers_with_flow)
                     # Atualiza imediatamente as cargas da infraestrutura para refletir os novos valores
                     self._update_infrastructure_loads()
                     self.log(f"MANUAL: Carga do Nó {node_id} alterada de {old_load:.1f}kW para {new_load:.1f}kW. Redistribuição proporcional recalculada.")
@@ -1685,7 +1686,7 @@ class GridSimulator:
             
             evt = GridEvent(
                 priority=priority,
-                timestamp=datetime.now(),
+                timestamp=self.time_tick,
                 event_type=EventType.OVERLOAD_WARNING, # Tratamos como um alerta de sobrecarga
                 node_id=node_id,
                 payload={
@@ -1716,8 +1717,7 @@ class GridSimulator:
         self.log("Carregando snapshot do disco...")
         
         # 1. Limpa o grafo atual antes de carregar
-        self.graph.nodes.clear()
-        self.graph.adj_list.clear()
+        self.graph.clear()
         
         # 2. Carrega a topologia
         topology_loaded = PersistenceManager.load_topology(self.graph)
@@ -1746,17 +1746,26 @@ class GridSimulator:
         return self.event_queue.get_statistics()
 
     def get_metrics(self) -> Dict[str, float]:
-        """Dados para o Dashboard."""
+        """
+        Dados para o Dashboard.
+        Sempre recalculado: cargas e estado ativo são alterados por muitos caminhos
+        (UI, balanceador, IoT), e a varredura única abaixo já é O(N).
+        """
         eff = EnergyHeuristics.calculate_global_efficiency(self.graph)
-        total_load = sum(n.current_load for n in self.graph.nodes.values())
+        
+        # Carga total e, para o diagnóstico, cargas ativas por nível hierárquico: uma única varredura
+        total_load = 0.0
+        active_load_by_type = {NodeType.CONSUMER: 0.0, NodeType.TRANSFORMER: 0.0, NodeType.SUBSTATION: 0.0}
+        for n in self.graph.nodes.values():
+            load = n.current_load
+            total_load += load
+            if n.active and n.type in active_load_by_type:
+                active_load_by_type[n.type] += load
         
         # Diagnóstico melhorado: calcula valores hierárquicos e detecta inconsistências
-        total_consumer_load = sum(n.current_load for n in self.graph.nodes.values() 
-                                  if n.active and n.type == NodeType.CONSUMER)
-        total_transformer_load = sum(n.current_load for n in self.graph.nodes.values() 
-                                    if n.active and n.type == NodeType.TRANSFORMER)
-        total_substation_load = sum(n.current_load for n in self.graph.nodes.values() 
-                                   if n.active and n.type == NodeType.SUBSTATION)
+        total_consumer_load = active_load_by_type[NodeType.CONSUMER]
+        total_transformer_load = active_load_by_type[NodeType.TRANSFORMER]
+        total_substation_load = active_load_by_type[NodeType.SUBSTATION]
         
         # CRÍTICO: Verifica consistência hierárquica
         # Os transformadores DEVEM ter carga >= consumidores (incluem consumidores + 5% perdas transformador + perdas cabos)
@@ -1866,7 +1875,7 @@ class GridSimulator:
         # Cria evento de manutenção para notificar a normalização
         evt = GridEvent(
             priority=PriorityLevel.MEDIUM,
-            timestamp=datetime.now(),
+            timestamp=self.time_tick,
             event_type=EventType.MAINTENANCE,
             node_id=node_id,
             payload={
@@ -1886,8 +1895,6 @@ class GridSimulator:
         # Isso será feito automaticamente quando a carga voltar ao normal
 
     def log(self, msg: str):
-        print(msg)
-        self.logs.append(msg)
-        # Mantém apenas os últimos 50 logs na memória da UI
-        if len(self.logs) > 50:
-            self.logs.pop(0)
\ No newline at end of file
+        if self.verbose:
+            print(msg)
+        self.logs.append(msg)
\ No newline at end of file
@@ -18,6 +18,29 @@ class AVLTree:
     def __init__(self):
         self.root = None
 
+    @classmethod
+    def build_from_sorted(cls, items):
+        """
+        Constrói uma árvore perfeitamente balanceada a partir de pares (chave, valor)
+        já ordenados por chave e sem chaves repetidas.
+        Complexidade: O(n), sem comparações nem rotações (contra O(n log n) de n inserções).
+        """
+        items = list(items)
+        tree = cls()
+
+        def build(lo, hi):
+            if lo > hi:
+                return None
+            mid = (lo + hi) // 2
+            node = AVLNode(*items[mid])
+            node.left = build(lo, mid - 1)
+            node.right = build(mid + 1, hi)
+            node.height = 1 + max(tree._get_height(node.left), tree._get_height(node.right))
+            return node
+
+        tree.root = build(0, len(items) - 1)
+        return tree
+
     def insert(self, key, value):
         """Insere um novo nó e rebalanceia a árvore automaticamente."""
         self.root = self._insert_recursive(self.root, key, value)
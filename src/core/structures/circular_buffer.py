@@ -25,10 +25,12 @@ class CircularBuffer:
         Adiciona uma nova leitura. Se cheio, sobrescreve a mais antiga.
         Complexidade: O(1)
         """
-        self.buffer[self.head] = item
+        head = self.head
+        self.buffer[head] = item
         
-        # Avança o ponteiro circularmente
-        self.head = (self.head + 1) % self.capacity
+        # Avança o ponteiro circularmente (comparação em vez de módulo)
+        head += 1
+        self.head = 0 if head == self.capacity else head
         
         if not self._is_full:
             self.size += 1
@@ -0,0 +1,119 @@
+import heapq
+import math
+from typing import Dict, List, Tuple, Optional
+
+class SpatialGrid:
+    """
+    Índice espacial por grade uniforme (hashing de células) para as coordenadas (x, y) dos nós.
+    Cada célula de lado `cell_size` guarda os itens cujas coordenadas caem nela, permitindo
+    consultas de vizinhança sem percorrer todos os nós.
+    """
+    def __init__(self, cell_size: float = 50.0):
+        if cell_size <= 0:
+            raise ValueError("O tamanho da célula deve ser maior que zero.")
+
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Tuple[int, float, float]]] = {}
+        self._size = 0
+        # Limites (em células) ocupados, usados para encerrar a busca em anéis
+        self._min_cx = self._max_cx = 0
+        self._min_cy = self._max_cy = 0
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, item_id: int, x: float, y: float):
+        """Insere um item na célula correspondente. Complexidade: O(1)"""
+        cx, cy = self._cell_of(x, y)
+        if self._size == 0:
+            self._min_cx = self._max_cx = cx
+            self._min_cy = self._max_cy = cy
+        else:
+            self._min_cx = min(self._min_cx, cx)
+            self._max_cx = max(self._max_cx, cx)
+            self._min_cy = min(self._min_cy, cy)
+            self._max_cy = max(self._max_cy, cy)
+        self._cells.setdefault((cx, cy), []).append((item_id, x, y))
+        self._size += 1
+
+    def clear(self):
+        """Remove todos os itens do índice."""
+        self._cells.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def within_radius(self, x: float, y: float, r: float) -> List[int]:
+        """
+        Retorna os IDs dos itens a até `r` de (x, y), ordenados pela distância.
+        Visita apenas as células que intersectam o círculo de busca.
+        """
+        if self._size == 0 or r < 0:
+            return []
+
+        min_cx, min_cy = self._cell_of(x - r, y - r)
+        max_cx, max_cy = self._cell_of(x + r, y + r)
+        # Restringe à área ocupada para não iterar células vazias com raios grandes
+        min_cx, max_cx = max(min_cx, self._min_cx), min(max_cx, self._max_cx)
+        min_cy, max_cy = max(min_cy, self._min_cy), min(max_cy, self._max_cy)
+
+        r_sq = r * r
+        found = []
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item_id, ix, iy in bucket:
+                    d_sq = (ix - x) ** 2 + (iy - y) ** 2
+                    if d_sq <= r_sq:
+                        found.append((d_sq, item_id))
+        found.sort()
+        return [item_id for _, item_id in found]
+
+    def nearest(self, x: float, y: float, k: int = 1, exclude: Optional[int] = None) -> List[int]:
+        """
+        Retorna os IDs dos `k` itens mais próximos de (x, y), do mais próximo ao mais distante.
+        A busca expande anéis de células ao redor do ponto e para assim que nenhum
+        item ainda não visitado pode estar mais perto que o k-ésimo encontrado.
+        """
+        if self._size == 0 or k <= 0:
+            return []
+
+        ox, oy = self._cell_of(x, y)
+        # Maior anel necessário para cobrir toda a área ocupada
+        max_ring = max(abs(ox - self._min_cx), abs(ox - self._max_cx),
+                       abs(oy - self._min_cy), abs(oy - self._max_cy))
+
+        best: List[Tuple[float, int]] = []  # Max-heap (distância negativa) com os k melhores
+        cells = self._cells
+        for ring in range(max_ring + 1):
+            for cx in range(ox - ring, ox + ring + 1):
+                # Nas colunas internas do anel só as bordas superior/inferior são novas
+                if cx == ox - ring or cx == ox + ring:
+                    cys = range(oy - ring, oy + ring + 1)
+                else:
+                    cys = (oy - ring, oy + ring) if ring else (oy,)
+                for cy in cys:
+                    bucket = cells.get((cx, cy))
+                    if not bucket:
+                        continue
+                    for item_id, ix, iy in bucket:
+                        if item_id == exclude:
+                            continue
+                        d_sq = (ix - x) ** 2 + (iy - y) ** 2
+                        if len(best) < k:
+                            heapq.heappush(best, (-d_sq, item_id))
+                        elif d_sq < -best[0][0]:
+                            heapq.heapreplace(best, (-d_sq, item_id))
+
+            # Qualquer item fora deste anel está a pelo menos ring * cell_size do ponto
+            if len(best) == k:
+                reach = ring * self.cell_size
+                if -best[0][0] <= reach * reach:
+                    break
+
+        best.sort(key=lambda p: (-p[0], p[1]))
+        return [item_id for _, item_id in best]
@@ -13,6 +13,9 @@ from src.core.models.node import NodeType
 from src.core.simulation.event_queue import PriorityLevel, EventType
 
 class EcoGridApp:
+    # Máximo de linhas exibidas na tabela da fila (o total aparece no contador)
+    MAX_QUEUE_ROWS = 100
+
     def __init__(self, root):
         self.root = root
         self.root.title("EcoGrid+ Simulator (Cenário Urbano Realista)")
@@ -226,9 +229,7 @@ class EcoGridApp:
         IMPORTANTE: Transformadores NÃO transferem carga entre si.
         A carga do transformador = soma dos consumidores + perdas dos cabos.
         """
-        self.sim.graph.nodes.clear()
-        self.sim.graph.adj_list.clear()
-        self.sim.graph.root_nodes.clear()
+        self.sim.graph.clear()
         from src.core.structures.avl_tree import AVLTree
         from src.core.io.iot_simulator import IoTSensorNetwork
         self.sim.avl = AVLTree()
@@ -383,9 +384,7 @@ class EcoGridApp:
         """
         Cria uma topologia 'Cidade' começando do ID 1.
         """
-        self.sim.graph.nodes.clear()
-        self.sim.graph.adj_list.clear()
-        self.sim.graph.root_nodes.clear()  # Limpa nós raiz também
+        self.sim.graph.clear()  # Limpa nós, arestas e nós raiz, invalidando os índices
         from src.core.structures.avl_tree import AVLTree
         from src.core.io.iot_simulator import IoTSensorNetwork
         self.sim.avl = AVLTree()
@@ -674,12 +673,8 @@ class EcoGridApp:
                 self.update_inspector()
 
     def _find_node_at_pos(self,x,y,r=20):
-        for n in self.sim.graph.nodes.values():
-            if ((n.x-x)**2+(n.y-y)**2)**0.5<=r: return n.id
-        return None
-    def _find_k_closest_nodes(self,x,y,k=2,eid=None):
-        d=[(((n.x-x)**2+(n.y-y)**2)**0.5,n.id) for n in self.sim.graph.nodes.values() if n.id!=eid]
-        d.sort(key=lambda p:p[0]); return [p[1] for p in d[:k]]
+        ids=self.sim.graph.within_radius(x,y,r); return ids[0] if ids else None
+    def _find_k_closest_nodes(self,x,y,k=2,eid=None): return self.sim.graph.nearest(x,y,k,exclude=eid)
     def _suggest_next_id(self): return max(self.sim.graph.nodes.keys())+1 if self.sim.graph.nodes else 1
     
     def toggle_noise(self): self.sim.enable_noise=not self.sim.enable_noise; self.btn_noise.config(text="🔊 ON" if self.sim.enable_noise else "🔇 OFF", relief=tk.RAISED if self.sim.enable_noise else tk.SUNKEN)
@@ -892,8 +887,8 @@ class EcoGridApp:
         for item in self.queue_tree.get_children():
             self.queue_tree.delete(item)
         
-        # Obtém todos os eventos da fila (ordenados por prioridade)
-        events = self.sim.event_queue.get_all_events()
+        # Obtém os próximos eventos da fila (ordenados por prioridade)
+        events = self.sim.event_queue.top_k(self.MAX_QUEUE_ROWS)
         
         # Obtém estatísticas da fila
         stats = self.sim.get_queue_statistics()
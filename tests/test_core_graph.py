@@ -57,5 +57,138 @@ def test_create_simple_grid():
     assert h_val == expected_h, "Erro no cálculo de h(n)"
     
     print(">> SUCESSO: Grafo e Heurística integrados.")
+
+def test_nodes_by_type_view():
+    grid = EcoGridGraph()
+    grid.add_node(1, NodeType.SUBSTATION, 10000)
+    grid.add_node(2, NodeType.TRANSFORMER, 500, parent_id=1)
+    grid.add_node(3, NodeType.CONSUMER, 15, parent_id=2)
+    
+    assert [n.id for n in grid.get_nodes_by_type(NodeType.CONSUMER)] == [3]
+    
+    # A visão acompanha novos nós e a limpeza do grafo
+    grid.add_node(4, NodeType.CONSUMER, 20, parent_id=2)
+    assert [n.id for n in grid.get_nodes_by_type(NodeType.CONSUMER)] == [3, 4]
+    grid.clear()
+    assert grid.get_nodes_by_type(NodeType.CONSUMER) == []
+
+def test_neighbors_by_type_cache():
+    grid = EcoGridGraph()
+    grid.add_node(1, NodeType.TRANSFORMER, 500)
+    grid.add_node(2, NodeType.TRANSFORMER, 500)
+    grid.add_node(3, NodeType.CONSUMER, 15, parent_id=1)
+    grid.add_edge(1, 3, 0.5, 0.2, 0.95)
+    
+    pairs = grid.get_neighbors_by_type(3, NodeType.TRANSFORMER)
+    assert [(n.id, line.source, line.target) for n, line in pairs] == [(1, 3, 1)]
+    assert grid.get_neighbors_by_type(3, NodeType.CONSUMER) == []
+    
+    # Nova aresta invalida o cache
+    grid.add_edge(2, 3, 0.6, 0.2, 0.95)
+    assert [n.id for n, _ in grid.get_neighbors_by_type(3, NodeType.TRANSFORMER)] == [1, 2]
+    
+    # Limpeza do grafo (como faz a UI) também invalida
+    grid.clear()
+    assert grid.get_neighbors_by_type(3, NodeType.TRANSFORMER) == []
+
+def test_edge_index():
+    grid = EcoGridGraph()
+    grid.add_node(1, NodeType.TRANSFORMER, 500)
+    grid.add_node(2, NodeType.CONSUMER, 15, parent_id=1)
+    grid.add_node(3, NodeType.CONSUMER, 15, parent_id=1)
+    grid.add_edge(1, 2, 0.5, 0.2, 0.95)
+    
+    line = grid.get_edge_obj(1, 2)
+    assert (line.source, line.target) == (1, 2)
+    assert grid.get_edge_obj(2, 1).target == 1
+    assert grid.get_edge_obj(1, 3) is None
+    
+    # Arestas novas e a limpeza do grafo são refletidas
+    grid.add_edge(1, 3, 0.7, 0.2, 0.95)
+    assert grid.get_edge_obj(1, 3).distance == 0.7
+    grid.clear()
+    assert grid.get_edge_obj(1, 2) is None
+    
+    # Recriar a mesma quantidade de nós sem arestas não pode servir linhas antigas
+    grid.add_node(1, NodeType.TRANSFORMER, 500)
+    grid.add_node(2, NodeType.CONSUMER, 15, parent_id=1)
+    grid.add_node(3, NodeType.CONSUMER, 15, parent_id=1)
+    assert grid.get_edge_obj(1, 2) is None
+    assert grid.get_neighbors_by_type(2, NodeType.TRANSFORMER) == []
+
+def _build_candidate_grid():
+    """Subestação 1, transformadores 10/20/30 e consumidores 100-105 ligados a 10 (pai) e a 20."""
+    grid = EcoGridGraph()
+    grid.add_node(1, NodeType.SUBSTATION, 10000)
+    for t_id in (10, 20, 30):
+        grid.add_node(t_id, NodeType.TRANSFORMER, 1000, efficiency=0.95, parent_id=1)
+        grid.add_edge(1, t_id, 10.0, 0.05, 0.99)
+    for i, c_id in enumerate(range(100, 106)):
+        consumer = grid.add_node(c_id, NodeType.CONSUMER, 100, parent_id=10)
+        consumer.current_load = 40.0 + i
+        grid.add_edge(10, c_id, 0.5, 0.2, 0.95)
+        grid.add_edge(20, c_id, 0.6, 0.2, 0.93 - i * 0.01)
+    return grid
+
+def test_global_efficiency_for_parents():
+    grid = _build_candidate_grid()
+    for t_id in (10, 20, 30):
+        grid.nodes[t_id].current_load = 150.0
+    grid.get_edge_obj(20, 103).current_flow = 12.0
+    
+    consumer = grid.nodes[102]
+    candidates = [10, 20, 30, None]
+    fast = EnergyHeuristics.calculate_global_efficiency_for_parents(grid, consumer, candidates)
+    
+    expected = []
+    for parent_id in candidates:
+        consumer.parent_id = parent_id
+        expected.append(EnergyHeuristics.calculate_global_efficiency(grid))
+    consumer.parent_id = 10
+    
+    # Mesmos valores da varredura completa (a menos de arredondamento); parent_id preservado
+    assert len(fast) == len(expected)
+    assert all(abs(f - e) <= 1e-9 * max(1.0, abs(e)) for f, e in zip(fast, expected))
+    assert consumer.parent_id == 10
+
+def test_global_efficiency_for_parents_with_loads():
+    grid = _build_candidate_grid()
+    grid.nodes[10].current_load = 150.0
+    grid.nodes[20].current_load = 80.0  # 30 fica sem carga: a parcela de perda do nó aparece só na simulação
+    
+    consumer = grid.nodes[102]
+    candidates = [10, 20, 30]
+    overrides = [
+        {10: max(0.0, 150.0 - consumer.current_load * 1.05), t_id: grid.nodes[t_id].current_load + consumer.current_load * 1.05}
+        for t_id in candidates
+    ]
+    state = {n_id: (node.parent_id, node.current_load) for n_id, node in grid.nodes.items()}
+    fast = EnergyHeuristics.calculate_global_efficiency_for_parents(grid, consumer, candidates, overrides)
+    
+    # Os nós ficam intactos: parent_id e cargas simuladas não são gravados
+    assert {n_id: (node.parent_id, node.current_load) for n_id, node in grid.nodes.items()} == state
+    
+    expected = []
+    for parent_id, loads in zip(candidates, overrides):
+        original = {n_id: grid.nodes[n_id].current_load for n_id in loads}
+        consumer.parent_id = parent_id
+        for n_id, load in loads.items():
+            grid.nodes[n_id].current_load = load
+        expected.append(EnergyHeuristics.calculate_global_efficiency(grid))
+        for n_id, load in original.items():
+            grid.nodes[n_id].current_load = load
+    consumer.parent_id = 10
+    
+    # Mesmos valores da varredura completa (a menos de arredondamento); parent_id e cargas preservados
+    assert len(fast) == len(expected)
+    assert all(abs(f - e) <= 1e-9 * max(1.0, abs(e)) for f, e in zip(fast, expected))
+    assert consumer.parent_id == 10
+    assert (grid.nodes[10].current_load, grid.nodes[20].current_load, grid.nodes[30].current_load) == (150.0, 80.0, 0.0)
+
 if __name__ == "__main__":
-    test_create_simple_grid()
\ No newline at end of file
+    test_create_simple_grid()
+    test_nodes_by_type_view()
+    test_neighbors_by_type_cache()
+    test_edge_index()
+    test_global_efficiency_for_parents()
+    test_global_efficiency_for_parents_with_loads()
@@ -124,6 +124,49 @@ def test_remove_event():
     
     print("[OK] Remocao de eventos funcionando corretamente")
 
+def test_lazy_removal_skipped_on_pop():
+    """Testa que eventos removidos não voltam no pop e não contam no tamanho."""
+    print("\n--- Teste: Remoção Preguiçosa ---")
+    pq = PriorityEventQueue()
+    
+    pq.push(GridEvent(PriorityLevel.CRITICAL, 0, EventType.NODE_FAILURE, 1, "A"))
+    pq.push(GridEvent(PriorityLevel.HIGH, 0, EventType.OVERLOAD_WARNING, 2, "B"))
+    pq.push(GridEvent(PriorityLevel.HIGH, 1, EventType.OVERLOAD_WARNING, 3, "C"))
+    
+    assert pq.remove_event(1, EventType.NODE_FAILURE)
+    assert pq.size() == 2, "Evento removido não deve contar no tamanho"
+    assert pq.peek().node_id == 2, "Topo deve ignorar evento removido"
+    
+    # Mesma prioridade: sai na ordem de chegada
+    assert [pq.pop().node_id, pq.pop().node_id] == [2, 3]
+    assert pq.pop() is None and pq.is_empty()
+    
+    print("[OK] Remoção preguiçosa funcionando corretamente")
+
+def test_push_many():
+    """Testa a inserção em lote."""
+    print("\n--- Teste: Inserção em Lote ---")
+    pq = PriorityEventQueue()
+    
+    events = [GridEvent(p, 0, EventType.LOAD_CHANGE, i) for i, p in enumerate([3, 1, 2, 0, 1])]
+    assert pq.push_many(events) == 5
+    assert pq.size() == 5
+    assert pq.has_event(3, EventType.LOAD_CHANGE)
+    
+    # Ordem por prioridade e, no empate, por ordem de chegada
+    order = [pq.pop().node_id for _ in range(5)]
+    assert order == [3, 1, 4, 2, 0], f"Ordem inesperada: {order}"
+
+    # Com check_duplicates, o último evento de cada (node_id, event_type) prevalece
+    pq.push(GridEvent(PriorityLevel.LOW, 0, EventType.NODE_FAILURE, 7))
+    batch = [GridEvent(PriorityLevel.HIGH, 1, EventType.NODE_FAILURE, 7),
+             GridEvent(PriorityLevel.CRITICAL, 2, EventType.NODE_FAILURE, 7)]
+    pq.push_many(batch, check_duplicates=True)
+    assert pq.size() == 1
+    assert pq.pop().priority == PriorityLevel.CRITICAL
+
+    print("[OK] Inserção em lote funcionando corretamente")
+
 def test_clear_old_events():
     """Testa a limpeza de eventos antigos."""
     print("\n--- Teste: Limpeza de Eventos Antigos ---")
@@ -152,6 +195,54 @@ def test_clear_old_events():
     
     print("[OK] Limpeza de eventos antigos funcionando corretamente")
 
+def test_clear_old_events_by_tick():
+    """Testa a limpeza de eventos com timestamps em ticks da simulação."""
+    print("\n--- Teste: Limpeza de Eventos Antigos (ticks) ---")
+    pq = PriorityEventQueue()
+    
+    pq.push(GridEvent(PriorityLevel.LOW, 10, EventType.LOAD_CHANGE, 1, "Antigo"), check_duplicates=False)
+    pq.push(GridEvent(PriorityLevel.HIGH, 90, EventType.OVERLOAD_WARNING, 2, "Recente"), check_duplicates=False)
+    
+    # No tick 100, eventos com mais de 50 ticks são removidos
+    removed = pq.clear_old_events(50, now=100)
+    assert removed == 1, "Deve remover 1 evento antigo"
+    assert pq.pop().node_id == 2, "Evento recente deve permanecer"
+    
+    print("[OK] Limpeza por ticks funcionando corretamente")
+
+def test_mixed_timestamps_rejected():
+    """Testa que a fila não mistura timestamps em ticks e datetime."""
+    print("\n--- Teste: Domínio de Timestamps ---")
+    pq = PriorityEventQueue()
+    pq.push(GridEvent(PriorityLevel.LOW, 10, EventType.LOAD_CHANGE, 1, "Tick"), check_duplicates=False)
+    
+    try:
+        pq.push(GridEvent(PriorityLevel.HIGH, datetime.now(), EventType.LOAD_CHANGE, 2, "Data"))
+        assert False, "Deve rejeitar timestamp datetime em fila de ticks"
+    except TypeError:
+        pass
+    try:
+        pq.push_many([GridEvent(PriorityLevel.HIGH, datetime.now(), EventType.LOAD_CHANGE, 3, "Data")])
+        assert False, "Deve rejeitar lote com timestamp datetime em fila de ticks"
+    except TypeError:
+        pass
+    assert pq.size() == 1, "Inserções rejeitadas não alteram a fila"
+    
+    # Fila em ticks exige o tick atual para limpar eventos antigos
+    try:
+        pq.clear_old_events(300.0)
+        assert False, "Deve exigir `now` em fila de ticks"
+    except ValueError:
+        pass
+    assert pq.get_statistics()['oldest_timestamp'] == 10
+    
+    # Esvaziada, a fila aceita o outro domínio
+    pq.pop()
+    pq.push(GridEvent(PriorityLevel.HIGH, datetime.now(), EventType.LOAD_CHANGE, 2, "Data"))
+    assert pq.clear_old_events(300.0) == 0
+    
+    print("[OK] Dominio de timestamps validado corretamente")
+
 def test_statistics():
     """Testa as estatísticas da fila."""
     print("\n--- Teste: Estatísticas ---")
@@ -233,6 +324,23 @@ def test_has_event():
     
     print("[OK] Verificacao de existencia funcionando corretamente")
 
+def test_get_event():
+    """Testa a consulta de um evento específico pelo índice."""
+    print("\n--- Teste: Consulta de Evento ---")
+    pq = PriorityEventQueue()
+    
+    pq.push(GridEvent(PriorityLevel.LOW, datetime.now(), EventType.OVERLOAD_WARNING, 10, "Antigo"), check_duplicates=False)
+    pq.push(GridEvent(PriorityLevel.HIGH, datetime.now(), EventType.OVERLOAD_WARNING, 10, "Urgente"), check_duplicates=False)
+    
+    # Com duplicatas, retorna o que sairia primeiro da fila (mesma ordem de get_all_events)
+    assert pq.get_event(10, EventType.OVERLOAD_WARNING).payload == "Urgente"
+    assert pq.get_event(10, EventType.NODE_FAILURE) is None, "Não deve encontrar evento inexistente"
+    
+    pq.pop()
+    assert pq.get_event(10, EventType.OVERLOAD_WARNING).payload == "Antigo"
+    
+    print("[OK] Consulta de evento funcionando corretamente")
+
 def test_clear_by_priority():
     """Testa a limpeza por prioridade."""
     print("\n--- Teste: Limpeza por Prioridade ---")
@@ -265,11 +373,16 @@ if __name__ == "__main__":
         test_max_size_limit()
         test_update_priority()
         test_remove_event()
+        test_lazy_removal_skipped_on_pop()
+        test_push_many()
         test_clear_old_events()
+        test_clear_old_events_by_tick()
+        test_mixed_timestamps_rejected()
         test_statistics()
         test_get_events_by_priority()
         test_get_events_by_node()
         test_has_event()
+        test_get_event()
         test_clear_by_priority()
         
         print("\n" + "=" * 60)
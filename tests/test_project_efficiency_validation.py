@@ -27,9 +27,7 @@ def setup_routing_demo_scenario(simulator: GridSimulator):
     Estrutura: 1 Subestação → 4 Transformadores → 10 Consumidores
     """
     # Limpa o grafo
-    simulator.graph.nodes.clear()
-    simulator.graph.adj_list.clear()
-    simulator.graph.root_nodes.clear()
+    simulator.graph.clear()
     simulator.avl = AVLTree()
     simulator.balancer.avl = simulator.avl
     if hasattr(simulator.balancer, 'load_avl'):
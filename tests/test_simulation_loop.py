@@ -4,6 +4,8 @@ import time
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.core.simulation.simulator import GridSimulator
+from src.core.simulation.event_queue import GridEvent, EventType, PriorityLevel
+from src.core.models.node import NodeType
 
 def test_simulation_run():
     print("--- Iniciando Teste do Maestro (Simulator) ---")
@@ -27,5 +29,150 @@ def test_simulation_run():
 
     print(">> SUCESSO: O Simulador integrou todos os módulos sem explodir.")
 
+def test_step_advances_one_tick():
+    sim = GridSimulator()
+    sim.initialize_default_scenario()
+    
+    for expected_tick in range(1, 6):
+        sim.step()
+        assert sim.time_tick == expected_tick, f"Tick inesperado: {sim.time_tick}"
+
+def test_critical_events_not_deferred():
+    sim = GridSimulator()
+    sim.enable_noise = False
+    
+    # Mais eventos CRITICAL do que o limite por tick, além de alguns LOW
+    for nid in range(sim.EVENTS_PER_TICK + 3):
+        sim.event_queue.push(GridEvent(PriorityLevel.CRITICAL, 0, EventType.MAINTENANCE, nid))
+    for nid in range(100, 103):
+        sim.event_queue.push(GridEvent(PriorityLevel.LOW, 0, EventType.LOAD_CHANGE, nid))
+    
+    sim.step()
+    
+    # Todos os CRITICAL são drenados no mesmo tick; os LOW esperam a vez
+    assert sim.event_queue.get_events_by_priority(PriorityLevel.CRITICAL) == []
+    assert sim.event_queue.size() == 3
+
+def test_persistent_failures_do_not_flood_step():
+    sim = GridSimulator()
+    sim.initialize_default_scenario()
+    sim.enable_noise = False
+    consumers = list(range(1000, 1060))
+    for node_id in consumers:
+        sim.graph.add_node(node_id, NodeType.CONSUMER, 50, parent_id=10)
+        sim.graph.add_edge(10, node_id, 0.5, 0.1, 0.98)
+    for node_id in consumers:
+        sim.inject_failure(node_id)
+    
+    handled = []
+    handle_event = sim._handle_event
+    def spy(event):
+        handled.append(event)
+        return handle_event(event)
+    sim._handle_event = spy
+    
+    # Falhas novas são drenadas de uma vez
+    sim.step()
+    assert len(handled) >= len(consumers)
+    
+    # Depois, as falhas persistentes (reinseridas) seguem o limite normal por tick
+    for _ in range(3):
+        handled.clear()
+        sim.logs.clear()
+        sim.step()
+        assert len(handled) <= sim.EVENTS_PER_TICK
+        assert sum("FALHA_NO" in line for line in sim.logs) <= sim.EVENTS_PER_TICK
+    assert sim.event_queue.size() >= len(consumers)
+
+def test_handle_event_dispatch():
+    sim = GridSimulator()
+    sim.initialize_default_scenario()
+    node = sim.graph.get_node(10)
+    
+    failure = GridEvent(PriorityLevel.CRITICAL, 0, EventType.NODE_FAILURE, 10)
+    node.active = False
+    assert sim._handle_event(failure) is True   # Nó ainda inativo: mantém na fila
+    node.active = True
+    assert sim._handle_event(failure) is False  # Nó reativado: remove
+    
+    # Tipos sem tratador específico são únicos
+    assert sim._handle_event(GridEvent(PriorityLevel.LOW, 0, EventType.LOAD_CHANGE, 10)) is False
+    assert sim._handle_event(GridEvent(PriorityLevel.MEDIUM, 0, EventType.MAINTENANCE, 10)) is False
+
+def test_step_skips_redundant_infrastructure_update():
+    sim = GridSimulator()
+    sim.enable_noise = False
+    sim._create_hardcoded_scenario()
+    
+    # Conta as chamadas de _update_infrastructure_loads
+    calls = []
+    update_loads = sim._update_infrastructure_loads
+    def spy():
+        calls.append(sim.time_tick)
+        update_loads()
+    sim._update_infrastructure_loads = spy
+    
+    # Sem ruído, sem eventos e sem fluxos: apenas a atualização do início do tick
+    sim.step()
+    assert len(calls) == 1
+    
+    # Um evento tratado no tick força a atualização final
+    sim.event_queue.push(GridEvent(PriorityLevel.LOW, 0, EventType.LOAD_CHANGE, 10))
+    calls.clear()
+    sim.step()
+    assert len(calls) == 2
+
+def test_overload_severity_levels():
+    sim = GridSimulator()
+    sim._create_hardcoded_scenario()
+    transformer = sim.graph.get_node(10)
+    
+    # Limiares inclusivos: 1.2 já é ALTA e 1.5 já é CRÍTICA
+    for ratio, expected in ((1.05, PriorityLevel.MEDIUM), (1.2, PriorityLevel.HIGH), (1.5, PriorityLevel.CRITICAL)):
+        transformer.current_load = transformer.max_capacity * ratio
+        sim._detect_overloads()
+        assert sim.event_queue.get_event(10, EventType.OVERLOAD_WARNING).priority == expected
+
+def test_manual_load_rescales_redistribution():
+    sim = GridSimulator()
+    sim._create_hardcoded_scenario()
+    sim.add_node(300, NodeType.CONSUMER, 200, 100, 100, parent_id=10)
+    sim.graph.add_edge(10, 300, 0.5, 0.2, 0.95)
+    sim.graph.add_edge(20, 300, 0.7, 0.2, 0.95)
+    sim.graph.get_node(300).current_load = 50.0
+    sim.graph.get_edge_obj(10, 300).current_flow = 30.0
+    sim.graph.get_edge_obj(20, 300).current_flow = 20.0
+    
+    sim.inject_manual_load(300, 100.0)
+    
+    # A proporção 60/40 entre os transformadores é mantida
+    assert abs(sim.graph.get_edge_obj(10, 300).current_flow - 60.0) < 1e-9
+    assert abs(sim.graph.get_edge_obj(20, 300).current_flow - 40.0) < 1e-9
+
+def test_metrics_reflect_manual_load():
+    sim = GridSimulator()
+    sim._create_hardcoded_scenario()
+    
+    before = sim.get_metrics()
+    consumer = sim.graph.get_node(101)
+    expected = before['total_load'] - consumer.current_load + 95.0
+    sim.inject_manual_load(101, 95.0)
+    
+    # Alteração fora de _update_infrastructure_loads também aparece nas métricas
+    assert abs(sim.get_metrics()['total_load'] - expected) < 1e-9
+    
+    # O dicionário retornado é do chamador: alterá-lo não afeta leituras seguintes
+    metrics = sim.get_metrics()
+    metrics['total_load'] = -1.0
+    assert sim.get_metrics()['total_load'] != -1.0
+
 if __name__ == "__main__":
-    test_simulation_run()
\ No newline at end of file
+    test_simulation_run()
+    test_step_advances_one_tick()
+    test_critical_events_not_deferred()
+    test_persistent_failures_do_not_flood_step()
+    test_handle_event_dispatch()
+    test_step_skips_redundant_infrastructure_update()
+    test_overload_severity_levels()
+    test_manual_load_rescales_redistribution()
+    test_metrics_reflect_manual_load()
@@ -78,5 +78,28 @@ def test_fifo_logic():
     
     print(">> SUCESSO: A ordem cronológica foi respeitada (Prioridade ignorada na FIFO).")
 
+def test_fifo_wraparound_and_growth():
+    print("--- Teste da Fila FIFO: buffer circular ---")
+    
+    queue = FIFOEventQueue(capacity=4)
+    
+    # Avança o head para forçar a volta do ponteiro antes de transbordar
+    for i in range(3):
+        queue.enqueue(GridEvent(PriorityLevel.LOW, i, EventType.LOAD_CHANGE, i))
+    assert queue.dequeue().node_id == 0
+    assert queue.dequeue().node_id == 1
+    
+    # Enfileira além da capacidade inicial (wrap + crescimento)
+    for i in range(3, 10):
+        queue.enqueue(GridEvent(PriorityLevel.LOW, i, EventType.LOAD_CHANGE, i))
+    assert queue.size() == 8, "Erro no tamanho após crescimento"
+    
+    order = [queue.dequeue().node_id for _ in range(8)]
+    assert order == list(range(2, 10)), f"Quebra de ordem FIFO após crescimento: {order}"
+    assert queue.dequeue() is None and queue.is_empty()
+    
+    print(">> SUCESSO: Ordem preservada com wrap-around e crescimento do buffer.")
+
 if __name__ == "__main__":
-    test_fifo_logic()
\ No newline at end of file
+    test_fifo_logic()
+    test_fifo_wraparound_and_growth()
\ No newline at end of file
@@ -46,5 +46,20 @@ def test_avl_balancing():
     else:
         print(f">> FALHA: Não encontrou o ID {search_id}.")
 
+def test_avl_build_from_sorted():
+    items = [(i, PowerNode(i, NodeType.CONSUMER, 100)) for i in range(0, 200, 2)]
+    avl = AVLTree.build_from_sorted(items)
+
+    # Árvore perfeitamente balanceada: altura mínima para 100 nós
+    assert avl._get_height(avl.root) == 7
+    assert [n.id for n in avl.get_all_values()] == list(range(0, 200, 2))
+    assert avl.search(42).id == 42 and avl.search(43) is None
+
+    # Continua uma AVL válida para inserções posteriores
+    avl.insert(43, PowerNode(43, NodeType.CONSUMER, 100))
+    assert avl.search(43).id == 43
+    assert AVLTree.build_from_sorted([]).root is None
+
 if __name__ == "__main__":
-    test_avl_balancing()
\ No newline at end of file
+    test_avl_balancing()
+    test_avl_build_from_sorted()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import sys
+import os
+import random
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.models.graph import EcoGridGraph
+from src.core.models.node import NodeType
+
+def test_spatial_queries_match_brute_force():
+    print("--- Iniciando Teste do Índice Espacial ---")
+
+    rng = random.Random(42)
+    g = EcoGridGraph()
+    for i in range(500):
+        g.add_node(i, NodeType.CONSUMER, 100.0, x=rng.uniform(0, 1200), y=rng.uniform(0, 800))
+
+    for _ in range(100):
+        x, y = rng.uniform(-100, 1300), rng.uniform(-100, 900)
+
+        # k vizinhos mais próximos devem coincidir com a busca exaustiva
+        expected = sorted(((n.x - x) ** 2 + (n.y - y) ** 2, n.id) for n in g.nodes.values() if n.id != 7)
+        assert g.nearest(x, y, k=3, exclude=7) == [nid for _, nid in expected[:3]]
+
+        # Busca por raio deve retornar exatamente os nós dentro do círculo
+        all_nodes = sorted(((n.x - x) ** 2 + (n.y - y) ** 2, n.id) for n in g.nodes.values())
+        assert g.within_radius(x, y, 60) == [nid for d_sq, nid in all_nodes if d_sq <= 60 ** 2]
+
+    print(">> SUCESSO: Consultas espaciais equivalentes à força bruta.")
+
+def test_spatial_index_tracks_topology_changes():
+    g = EcoGridGraph()
+    g.add_node(1, NodeType.SUBSTATION, 1000.0, x=0, y=0)
+    assert g.nearest(10, 10) == [1]
+
+    # Novo nó deve invalidar o índice
+    g.add_node(2, NodeType.TRANSFORMER, 500.0, x=9, y=9)
+    assert g.nearest(10, 10) == [2]
+
+    # Limpeza do grafo também invalida
+    g.clear()
+    assert g.nearest(10, 10) == []
+    assert g.within_radius(0, 0, 100) == []
+
+if __name__ == "__main__":
+    test_spatial_queries_match_brute_force()
+    test_spatial_index_tracks_topology_changes()
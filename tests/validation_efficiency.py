@@ -20,8 +20,7 @@ def clean_persistence():
 
 def create_complex_mesh_topology(sim: GridSimulator):
     """Cria uma rede tipo 'Grid' 5x6 (30 nós)."""
-    sim.graph.nodes.clear()
-    sim.graph.adj_list.clear()
+    sim.graph.clear()
     
     from src.core.structures.avl_tree import AVLTree
     sim.avl = AVLTree() 